@@ -0,0 +1,284 @@
+# aio_api.py
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # без aiohttp работаем через пул requests в потоках
+    aiohttp = None
+
+import api
+from cache import get_cache, make_key
+from http_client import BACKOFF_BASE, BACKOFF_MAX, CONNECT_TIMEOUT, MAX_RETRIES, READ_TIMEOUT, RETRY_STATUSES
+
+DEFAULT_CONCURRENCY = 16
+# rate limit на хост — по желанию (запросов в секунду); по умолчанию ограничивает только concurrency
+DEFAULT_RATE = None
+DEFAULT_BURST = None    # None — равен concurrency, чтобы первая пачка уходила сразу
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncMealDB:
+    """Асинхронный клиент TheMealDB для массовой загрузки.
+
+    Один пул соединений на клиент, общий лимит параллельности, rate limit на хост — по желанию (rate=).
+    Ответы JSON идут через тот же постоянный кэш, что и api.py.
+
+        async with AsyncMealDB() as db:
+            meals = await db.get_meals_by_ids(ids)
+    """
+
+    def __init__(self, base=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                 burst=DEFAULT_BURST, max_retries=MAX_RETRIES, use_cache=True):
+        self.base = base or api.API_BASE
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst or concurrency
+        self.max_retries = max_retries
+        self.use_cache = use_cache
+        self._sem = None
+        self._buckets = {}
+        self._session = None
+        self._requests = None       # requests.Session, если aiohttp нет
+        self._executor = None
+
+    async def __aenter__(self):
+        self._sem = asyncio.Semaphore(self.concurrency)
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=15, connect=4),
+                headers={"User-Agent": "MealFinder/1.0"},
+            )
+        else:
+            # свой пул соединений размером с concurrency: у общего клиента их меньше, и при большой
+            # пачке лишние keep-alive соединения выбрасывались бы ("Connection pool is full")
+            import requests
+            from requests.adapters import HTTPAdapter
+            self._requests = requests.Session()
+            self._requests.headers["User-Agent"] = "MealFinder/1.0"
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concurrency)
+            self._requests.mount("http://", adapter)
+            self._requests.mount("https://", adapter)
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="aio-http")
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._requests is not None:
+            self._requests.close()
+            self._requests = None
+
+    # ---------------- transport ----------------
+    async def _get_bytes(self, url, params=None):
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None and self.rate:
+            bucket = self._buckets[host] = _TokenBucket(self.rate, self.burst)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                await bucket.acquire()
+            try:
+                async with self._sem:
+                    return await self._request(url, params)
+            except Exception as e:
+                if not _is_transient(e) or attempt >= self.max_retries:
+                    raise
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+            await asyncio.sleep(random.uniform(0, delay))
+            attempt += 1
+
+    async def _request(self, url, params):
+        if self._session is None:
+            # запасной путь: keep-alive пул requests в потоках (ретраи делаем сами)
+            session = self._requests
+            r = await asyncio.get_running_loop().run_in_executor(
+                self._executor, lambda: session.get(url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)))
+            status, body = r.status_code, r.content
+        else:
+            async with self._session.get(url, params=params) as r:
+                status, body = r.status, await r.read()
+        if status in RETRY_STATUSES:
+            raise _TransientStatus(status)
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status} for {url}")
+        return body
+
+    async def _get_json(self, endpoint, params=None):
+        cache = get_cache() if self.use_cache else None
+        ttl = cache.ttl_for(endpoint) if cache else 0
+        key = make_key(endpoint, params)
+        cached = None
+        if ttl > 0:
+            cached = await asyncio.to_thread(cache.peek, key)
+            if cached is not None and time.time() - cached[1] < ttl:
+                cache.hits += 1
+                return cached[0]
+        try:
+            body = await self._get_bytes(f"{self.base}{endpoint}", params)
+        except Exception:
+            if cached is not None:
+                cache.stale_hits += 1
+                return cached[0]  # офлайн — отдаём устаревшее
+            raise
+        data = json.loads(body)
+        if ttl > 0:
+            cache.misses += 1
+            await asyncio.to_thread(cache.put, key, endpoint, data)
+        return data
+
+    # ---------------- same functions as api.py ----------------
+    async def search_meals(self, name):
+        try:
+            data = await self._get_json("search.php", {"s": name})
+            if data and data.get("meals"):
+                return data["meals"]
+        except Exception:
+            return []
+        return []
+
+    async def search_meal(self, name):
+        meals = await self.search_meals(name)
+        return meals[0] if meals else None
+
+    async def get_random_meal(self):
+        try:
+            data = await self._get_json("random.php")
+            return data["meals"][0]
+        except Exception:
+            return None
+
+    async def get_meal_by_id(self, meal_id):
+        try:
+            data = await self._get_json("lookup.php", {"i": meal_id})
+            if data and data.get("meals"):
+                return data["meals"][0]
+        except Exception:
+            return None
+        return None
+
+    async def get_categories(self):
+        try:
+            data = await self._get_json("categories.php")
+            if data and data.get("categories"):
+                return [c["strCategory"] for c in data["categories"]]
+        except Exception:
+            return []
+        return []
+
+    async def get_areas(self):
+        try:
+            data = await self._get_json("list.php", {"a": "list"})
+            if data and data.get("meals"):
+                return [a["strArea"] for a in data["meals"]]
+        except Exception:
+            return []
+        return []
+
+    async def filter_meals(self, category=None, area=None):
+        if category and area:
+            by_cat, by_area = await asyncio.gather(self.filter_meals(category=category),
+                                                   self.filter_meals(area=area))
+            area_ids = {m.get("idMeal") for m in by_area}
+            return [m for m in by_cat if m.get("idMeal") in area_ids]
+        params = {"c": category} if category else {"a": area} if area else None
+        if not params:
+            return []
+        try:
+            data = await self._get_json("filter.php", params)
+            if data and data.get("meals"):
+                return data["meals"]
+        except Exception:
+            return []
+        return []
+
+    # ---------------- batch ----------------
+    async def get_meals_by_ids(self, ids):
+        # порядок результата совпадает с ids; ненайденные -> None
+        return await asyncio.gather(*(self.get_meal_by_id(i) for i in ids))
+
+    async def fetch_thumbnails(self, urls, size=None):
+        """{url: bytes} или, если задан size, {url: PIL.Image} уже уменьшенных (и сохранённых на диск)."""
+        async def one(url):
+            if size is not None:
+                import image_cache
+                disk = image_cache.get_disk_cache()
+                img = await asyncio.to_thread(disk.load, url, size)
+                if img is not None:
+                    return url, img
+            try:
+                body = await self._get_bytes(url)
+            except Exception:
+                return url, None
+            if size is None:
+                return url, body
+            return url, await asyncio.to_thread(_resize_and_store, url, body, size)
+
+        pairs = await asyncio.gather(*(one(u) for u in dict.fromkeys(u for u in urls if u)))
+        return dict(pairs)
+
+
+class _TransientStatus(Exception):
+    pass
+
+
+def _is_transient(e):
+    if isinstance(e, (_TransientStatus, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if aiohttp is not None and isinstance(e, aiohttp.ClientConnectionError):
+        return True
+    import requests
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+
+def _resize_and_store(url, body, size):
+    import image_cache
+    try:
+        img = image_cache.fit(image_cache.decode(body, size), size)
+    except Exception:
+        return None
+    image_cache.get_disk_cache().store(url, size, img)
+    return img
+
+
+# ---------------- sync helpers ----------------
+def get_meals_by_ids(ids, **kw):
+    async def go():
+        async with AsyncMealDB(**kw) as db:
+            return await db.get_meals_by_ids(ids)
+    return asyncio.run(go())
+
+def fetch_thumbnails(urls, size=None, **kw):
+    async def go():
+        async with AsyncMealDB(**kw) as db:
+            return await db.fetch_thumbnails(urls, size=size)
+    return asyncio.run(go())
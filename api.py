@@ -1,57 +1,84 @@
 # api.py
-import requests
+import os
 
-API_BASE = "https://www.themealdb.com/api/json/v1/1/"
+from cache import get_cache, make_key
+from http_client import get_client
+from tracing import traced
 
-def search_meal(name):
+# базовый URL можно подменить (например, на локальный сервер для бенчмарков)
+API_BASE = os.environ.get("MEALDB_API_BASE", "https://www.themealdb.com/api/json/v1/1/")
+
+def _fetch_json(endpoint, params=None, timeout=None):
+    return get_client().get_json(f"{API_BASE}{endpoint}", params=params, timeout=timeout, endpoint=endpoint)
+
+def _get_json(endpoint, params=None, timeout=None, cached_only=False):
+    # сначала постоянный кэш; устаревшие ответы обновляются в фоне, офлайн отдаётся последний ответ
+    if cached_only:
+        # только то, что уже лежит в кэше (без сети), например для мгновенной отрисовки при старте
+        cached = get_cache().peek(make_key(endpoint, params))
+        return cached[0] if cached else None
+    return get_cache().get_or_fetch(endpoint, params, lambda: _fetch_json(endpoint, params, timeout))
+
+@traced("api.search_meals", cat="api")
+def search_meals(name):
+    # все блюда, в названии которых есть name (search.php ищет подстроку без учёта регистра)
     try:
-        r = requests.get(f"{API_BASE}search.php", params={"s": name}, timeout=8)
-        data = r.json()
+        data = _get_json("search.php", {"s": name})
         if data and data.get("meals"):
-            return data["meals"][0]
+            return data["meals"]
     except Exception:
-        return None
-    return None
+        return []
+    return []
+
+def search_meal(name):
+    meals = search_meals(name)
+    return meals[0] if meals else None
 
+@traced("api.get_random_meal", cat="api")
 def get_random_meal():
     try:
-        r = requests.get(f"{API_BASE}random.php", timeout=8)
-        data = r.json()
+        data = _get_json("random.php")
         return data["meals"][0]
     except Exception:
         return None
 
+@traced("api.get_meal_by_id", cat="api")
 def get_meal_by_id(meal_id):
     try:
-        r = requests.get(f"{API_BASE}lookup.php", params={"i": meal_id}, timeout=8)
-        data = r.json()
+        data = _get_json("lookup.php", {"i": meal_id})
         if data and data.get("meals"):
             return data["meals"][0]
     except Exception:
         return None
     return None
 
-def get_categories():
+@traced("api.get_categories", cat="api")
+def get_categories(cached_only=False):
     try:
-        r = requests.get(f"{API_BASE}categories.php", timeout=8)
-        data = r.json()
+        data = _get_json("categories.php", cached_only=cached_only)
         if data and data.get("categories"):
             return [c["strCategory"] for c in data["categories"]]
     except Exception:
         return []
     return []
 
-def get_areas():
+@traced("api.get_areas", cat="api")
+def get_areas(cached_only=False):
     try:
-        r = requests.get(f"{API_BASE}list.php?a=list", timeout=8)
-        data = r.json()
+        data = _get_json("list.php", {"a": "list"}, cached_only=cached_only)
         if data and data.get("meals"):
             return [a["strArea"] for a in data["meals"]]
     except Exception:
         return []
     return []
 
-def filter_meals(category=None, area=None):
+@traced("api.filter_meals", cat="api")
+def filter_meals(category=None, area=None, cached_only=False):
+    if category and area:
+        # filter.php учитывает только один параметр — пересекаем два списка локально
+        by_area = {m.get("idMeal") for m in filter_meals(area=area, cached_only=cached_only)}
+        return [m for m in filter_meals(category=category, cached_only=cached_only)
+                if m.get("idMeal") in by_area]
     params = {}
     if category:
         params["c"] = category
@@ -60,10 +87,15 @@ def filter_meals(category=None, area=None):
     if not params:
         return []
     try:
-        r = requests.get(f"{API_BASE}filter.php", params=params, timeout=10)
-        data = r.json()
+        data = _get_json("filter.php", params, timeout=(4, 10), cached_only=cached_only)
         if data and data.get("meals"):
             return data["meals"]  # each item has idMeal, strMeal, strMealThumb
     except Exception:
         return []
     return []
+
+def get_latency_stats():
+    return get_client().stats.snapshot()
+
+def get_cache_stats():
+    return get_cache().stats()
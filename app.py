@@ -0,0 +1,212 @@
+# app.py
+import os
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from image_cache import ByteLRU, IMAGE_SIZE, get_disk_cache, load_thumbnail
+from pins import load_pinned_thumbnail, pin_favorites
+from prefetch import Prefetcher
+from scheduler import Scheduler
+from search_view import SearchView
+from tracing import get_tracer, span
+from utils import get_store
+from ui_common import BG, apply_style
+
+# скрытая вкладка с замерами: Ctrl+Shift+D или MEALFINDER_DEBUG=1
+DEBUG_TAB = os.environ.get("MEALFINDER_DEBUG", "0") == "1"
+# как часто проверять, не менял ли избранное другой процесс (два os.stat за проверку)
+FAV_POLL_MS = 1000
+# фоновый проход по пинам избранного стартует после первых запросов окна
+PIN_DELAY_MS = 3000
+
+
+class MealFinderApp:
+    """Главное окно: пул задач, кэш PhotoImage, вкладки.
+
+    Вкладка "Поиск" строится сразу, остальные — при первом переключении на них.
+    Сеть и диск не трогаются до start(), поэтому окно появляется без ожидания.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        root.title("MealFinder — Dark Purple")
+        root.geometry("1200x800")
+        root.configure(bg=BG)
+        apply_style(root)
+
+        # ---------------- worker pool ----------------
+        # фиксированный пул; callbacks доставляются в Tk-поток через root.after.
+        # channel: новый запрос отменяет устаревшие; key: одинаковые запросы объединяются
+        self.scheduler = Scheduler(max_workers=6, dispatch=self.dispatch)
+
+        # ---------------- image cache ----------------
+        # память: LRU PhotoImage с лимитом по байтам; диск: уже уменьшенные 300x300 PNG.
+        # Скачивание/декодирование/ресайз — в пуле, PhotoImage создаётся только в Tk-потоке.
+        self._image_cache = ByteLRU()
+
+        # фоновая подгрузка соседних результатов (детали + картинки) в кэши
+        self.prefetcher = Prefetcher(dispatch=self.dispatch,
+                                     on_image=lambda url, img: self.photo_from_image(url, img))
+
+        # ---------------- Notebook / Tabs ----------------
+        self.notebook = ttk.Notebook(root)
+        self.tab_search = ttk.Frame(self.notebook, padding=6)
+        self.tab_fav = ttk.Frame(self.notebook, padding=6)
+        self.tab_pantry = ttk.Frame(self.notebook, padding=6)
+        self.notebook.add(self.tab_search, text="Поиск")
+        self.notebook.add(self.tab_fav, text="Избранное")
+        self.notebook.add(self.tab_pantry, text="Что приготовить")
+        self.notebook.pack(expand=True, fill="both")
+
+        self.search_view = SearchView(self, self.tab_search)
+        self.favorites_view = None
+        self.pantry_view = None
+        self.debug_view = None
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        root.bind("<Control-Shift-D>", lambda e: self.toggle_debug_tab())
+        if DEBUG_TAB:
+            self.toggle_debug_tab(select=False)
+        self._started = False
+        self._pinning = False
+        self._pin_again = False
+
+    def dispatch(self, cb):
+        self.root.after(0, cb)
+
+    def run_async(self, fn, on_done=None, key=None, channel=None, on_error=None):
+        return self.scheduler.submit(fn, on_done=on_done, key=key, channel=channel, on_error=on_error)
+
+    def photo_from_image(self, url, img, size=IMAGE_SIZE):
+        # вызывается только в Tk-потоке
+        tkimg = self._image_cache.get((url, size))
+        if tkimg is None and img is not None:
+            from PIL import ImageTk
+            with span("tk.photo_image", "tk"):
+                tkimg = ImageTk.PhotoImage(img)
+            self._image_cache.put((url, size), tkimg, img.width * img.height * 4)
+        return tkimg
+
+    def fetch_image_tk(self, url, on_ready, channel=None, size=IMAGE_SIZE, meal_id=None):
+        # meal_id: блюдо из избранного — картинка берётся из офлайн-пина, если он есть
+        if not url:
+            return
+        tkimg = self._image_cache.get((url, size))
+        if tkimg is not None:
+            with span("ui.fetch_image_tk", "ui", hit=True):
+                on_ready(tkimg)
+            return
+        start = time.perf_counter_ns()
+
+        def done(img):
+            on_ready(self.photo_from_image(url, img, size))
+            # полный путь: очередь пула + загрузка + PhotoImage + отрисовка
+            get_tracer().record("ui.fetch_image_tk", "ui", start, time.perf_counter_ns() - start, args={"hit": False})
+
+        if meal_id:
+            task = lambda: load_pinned_thumbnail(meal_id, url, size)
+        else:
+            task = lambda: load_thumbnail(url, size)
+        # ошибка тоже отвечает on_ready(None): сетка миниатюр освобождает слот загрузки
+        self.run_async(task, on_done=done, on_error=lambda e: on_ready(None),
+                       key=("image", url, size), channel=channel)
+
+    # ---------------- tabs ----------------
+    def ensure_favorites_view(self):
+        if self.favorites_view is None:
+            from favorites_view import FavoritesView
+            self.favorites_view = FavoritesView(self, self.tab_fav)
+            self.favorites_view.populate()
+        return self.favorites_view
+
+    def favorites_changed(self):
+        # ещё не построенная вкладка прочитает избранное сама при первом открытии
+        if self.favorites_view is not None:
+            self.favorites_view.populate()
+        self.pin_favorites()
+
+    def pin_favorites(self):
+        # офлайн-пины: полные записи + миниатюры; пока идёт проход, следующий только запоминается
+        if self._pinning:
+            self._pin_again = True
+            return
+        self._pinning = True
+        self._pin_again = False
+        self.run_async(pin_favorites, on_done=self.on_favorites_pinned,
+                       on_error=lambda e: self.on_favorites_pinned(None))
+
+    def on_favorites_pinned(self, stats):
+        self._pinning = False
+        if stats and stats["hydrated"] and self.favorites_view is not None:
+            self.favorites_view.populate()
+        if self._pin_again:
+            self.pin_favorites()
+
+    def watch_favorites(self):
+        store = get_store(create=False)
+        if store is not None:
+            self.run_async(store.refresh, on_done=self.on_favorites_refreshed, key=("fav-watch",))
+        self.root.after(FAV_POLL_MS, self.watch_favorites)
+
+    def on_favorites_refreshed(self, changed):
+        if not changed:
+            return
+        if self.favorites_view is not None:
+            self.favorites_view.apply_changes(changed)
+        self.search_view.favorites_refreshed(changed)
+        self.pin_favorites()
+
+    def open_meal(self, meal_id):
+        # switch to main tab and show meal there
+        self.notebook.select(self.tab_search)
+        self.search_view.open_meal(meal_id)
+
+    def toggle_debug_tab(self, select=True):
+        if self.debug_view is None:
+            from debug_view import DebugView
+            self.tab_debug = ttk.Frame(self.notebook, padding=6)
+            self.debug_view = DebugView(self, self.tab_debug)
+            self.notebook.add(self.tab_debug, text="Debug")
+        elif str(self.tab_debug) in self.notebook.tabs():
+            self.debug_view.stop()
+            self.notebook.hide(self.tab_debug)
+            return
+        else:
+            self.notebook.add(self.tab_debug)
+        if select:
+            self.notebook.select(self.tab_debug)
+
+    def on_tab_changed(self, event):
+        # keep canvas scrolled to top when switching tabs
+        current = self.notebook.select()
+        if current == str(self.tab_fav):
+            self.ensure_favorites_view().canvas.yview_moveto(0)
+        elif current == str(self.tab_pantry) and self.pantry_view is None:
+            from pantry_view import PantryView
+            self.pantry_view = PantryView(self, self.tab_pantry)
+        self.search_view.canvas.yview_moveto(0)
+        # таблицу замеров пересчитываем только пока вкладка видна
+        if self.debug_view is not None:
+            if current == str(self.tab_debug):
+                self.debug_view.start()
+            else:
+                self.debug_view.stop()
+
+    # ---------------- Start / initial population ----------------
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self.search_view.startup.start()
+        self.run_async(lambda: get_disk_cache().prune())
+        self.root.after(FAV_POLL_MS, self.watch_favorites)
+        self.root.after(PIN_DELAY_MS, self.pin_favorites)
+
+    def run(self):
+        self.start()
+        self.root.mainloop()
+
+
+def create_app(root=None):
+    """Создаёт окно и вкладки; загрузка данных начинается в app.start()/app.run()."""
+    return MealFinderApp(root or tk.Tk())
@@ -0,0 +1,155 @@
+# bench/fake_server.py
+# Локальная замена TheMealDB для бенчмарков: те же эндпоинты, данные из favorites.json,
+# настраиваемая задержка. Запуск отдельно: python bench/fake_server.py --port 8765 --latency 50
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "favorites.json")
+
+CATEGORIES = ["Beef", "Chicken", "Dessert", "Lamb", "Pasta", "Pork", "Seafood", "Side",
+              "Starter", "Vegan", "Vegetarian", "Breakfast", "Goat", "Miscellaneous"]
+AREAS = ["American", "British", "Canadian", "Chinese", "French", "Greek", "Indian", "Italian",
+         "Japanese", "Mexican", "Russian", "Spanish", "Thai", "Turkish", "Ukrainian"]
+
+
+def build_catalog(count=300, seed=42):
+    """count блюд: шаблоны из favorites.json с новыми id, названиями, категориями и странами."""
+    with open(FIXTURES, "r", encoding="utf-8") as f:
+        templates = json.load(f)
+    rng = random.Random(seed)
+    meals = []
+    for i in range(count):
+        meal = dict(templates[i % len(templates)])
+        meal_id = str(60000 + i)
+        meal["idMeal"] = meal_id
+        meal["strMeal"] = f"{meal['strMeal']} {i}"
+        meal["strCategory"] = CATEGORIES[i % len(CATEGORIES)]
+        meal["strArea"] = rng.choice(AREAS)
+        meal["strMealThumb"] = f"/images/{meal_id}.jpg"
+        meals.append(meal)
+    return meals
+
+
+def make_jpeg(size=(700, 700), seed=0):
+    from PIL import Image
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # массовые параллельные запросы не должны упираться в backlog
+
+
+class FakeMealDB:
+    def __init__(self, count=300, latency_ms=0.0, jitter_ms=0.0, seed=42, port=0):
+        self.meals = build_catalog(count, seed)
+        self.by_id = {m["idMeal"]: m for m in self.meals}
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._image = make_jpeg(seed=seed)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = 64 * 1024  # заголовки и тело одним пакетом (иначе Nagle + delayed ACK)
+
+            def do_GET(self):
+                server.requests += 1
+                server._sleep()
+                status, ctype, body = server.route(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _Server(("127.0.0.1", port), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}/api/json/v1/1/"
+        for m in self.meals:
+            m["strMealThumb"] = f"http://127.0.0.1:{self.httpd.server_port}{m['strMealThumb']}"
+
+    def _sleep(self):
+        if self.latency or self.jitter:
+            with self._rng_lock:
+                extra = self._rng.uniform(0, self.jitter)
+            time.sleep(self.latency + extra)
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ---------------- routing ----------------
+    def route(self, path):
+        parts = urlsplit(path)
+        q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        name = parts.path.rsplit("/", 1)[-1]
+        if parts.path.startswith("/images/"):
+            return 200, "image/jpeg", self._image
+        if name == "search.php":
+            if "f" in q:
+                found = [m for m in self.meals if m["strMeal"].lower().startswith(q["f"].lower())]
+            else:
+                found = [m for m in self.meals if q.get("s", "").lower() in m["strMeal"].lower()]
+            return self._json({"meals": found or None})
+        if name == "lookup.php":
+            meal = self.by_id.get(q.get("i"))
+            return self._json({"meals": [meal] if meal else None})
+        if name == "random.php":
+            with self._rng_lock:
+                meal = self._rng.choice(self.meals)
+            return self._json({"meals": [meal]})
+        if name == "categories.php":
+            return self._json({"categories": [{"strCategory": c} for c in CATEGORIES]})
+        if name == "list.php":
+            return self._json({"meals": [{"strArea": a} for a in AREAS]})
+        if name == "filter.php":
+            if "c" in q:
+                found = [m for m in self.meals if m["strCategory"] == q["c"]]
+            elif "a" in q:
+                found = [m for m in self.meals if m["strArea"] == q["a"]]
+            elif "i" in q:
+                found = [m for m in self.meals
+                         if any((m.get(f"strIngredient{i}") or "").lower() == q["i"].lower() for i in range(1, 21))]
+            else:
+                found = []
+            summary = [{"idMeal": m["idMeal"], "strMeal": m["strMeal"], "strMealThumb": m["strMealThumb"]}
+                       for m in found]
+            return self._json({"meals": summary or None})
+        return 404, "application/json", b"{}"
+
+    def _json(self, data):
+        return 200, "application/json", json.dumps(data).encode("utf-8")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Fake TheMealDB server")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=50.0, help="ms per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random ms (seeded)")
+    ap.add_argument("--meals", type=int, default=300)
+    args = ap.parse_args()
+    srv = FakeMealDB(args.meals, args.latency, args.jitter, port=args.port)
+    print(f"MEALDB_API_BASE={srv.base}")
+    srv.httpd.serve_forever()
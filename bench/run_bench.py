@@ -0,0 +1,216 @@
+# bench/run_bench.py
+# Headless-бенчмарки MealFinder против локального fake-сервера (bench/fake_server.py).
+#
+#   python bench/run_bench.py                    # все сценарии
+#   python bench/run_bench.py -k favorites -n 20 # только избранное, 20 итераций
+#   python bench/run_bench.py --latency 80 --json bench_output.json
+#
+# Печатает p50/p95/p99 (мс) по каждому сценарию. Кэши и избранное живут во временной
+# папке, сеть — только локальный сервер, поэтому числа воспроизводимы между запусками.
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="mealfinder-bench-")
+# до импорта модулей приложения: пути кэшей читаются при импорте
+os.environ["MEALFINDER_CACHE_DIR"] = os.path.join(WORKDIR, "cache")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import api  # noqa: E402
+import catalog  # noqa: E402
+import filters  # noqa: E402
+import image_cache  # noqa: E402
+import pantry  # noqa: E402
+import utils  # noqa: E402
+from cache import get_cache  # noqa: E402
+from fake_server import FakeMealDB  # noqa: E402
+from models import Recipe  # noqa: E402
+from scheduler import Scheduler  # noqa: E402
+from startup import StartupOrchestrator  # noqa: E402
+
+FAVORITE_SIZES = (10, 1000, 10000)
+
+
+def percentile(sorted_values, p):
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    # ранг = ceil(p/100 * n); p * n / 100 — без ошибки округления вида 0.29 * 100 = 28.999…
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p * len(sorted_values) / 100) - 1))
+    return sorted_values[k]
+
+
+def measure(fn, iterations, setup=None):
+    samples = []
+    for i in range(iterations):
+        state = setup(i) if setup else None
+        start = time.perf_counter()
+        fn(i, state)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return {"n": len(samples), "p50": percentile(samples, 50), "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99), "max": samples[-1] if samples else 0.0}
+
+
+# ---------------- scenarios ----------------
+def scenario_cold_start(server, n):
+    sched = Scheduler(max_workers=6)
+    pending = []
+
+    def start_app(i, _):
+        def submit(fn, on_done=None):
+            pending.append(sched.submit(fn, on_done=on_done))
+
+        painted = []
+        o = StartupOrchestrator(submit, painted.append, painted.append, painted.append)
+        o.start()
+        while "interactive" not in o.timings:
+            time.sleep(0.0005)
+
+    def drain():
+        # прогрев фильтров не входит в замер, но должен закончиться до следующей итерации
+        while pending:
+            pending.pop().future.result()
+
+    def cold(i):
+        drain()
+        get_cache().clear()
+        filters._engine = None
+
+    return {"start[cold cache]": measure(start_app, n, cold),
+            "start[warm cache]": measure(start_app, n, lambda i: drain())}
+
+
+def scenario_search(server, n):
+    names = [m["strMeal"].split()[0] for m in server.meals]
+    out = {"search[network]": measure(lambda i, _: api.search_meal(names[i % len(names)]), n,
+                                      lambda i: get_cache().clear())}
+    api.search_meal(names[0])
+    out["search[cached]"] = measure(lambda i, _: api.search_meal(names[0]), n)
+    cat = catalog.Catalog(os.path.join(WORKDIR, f"catalog-{time.time_ns()}.sqlite3"))
+    cat.add_meals(server.meals)
+    out["search[local catalog]"] = measure(lambda i, _: cat.search(names[i % len(names)]), n)
+    out["search[local ingredients]"] = measure(lambda i, _: cat.query("has chicken AND ginger"), n)
+    return out
+
+
+def scenario_filter(server, n):
+    out = {"filter[category network]": measure(lambda i, _: api.filter_meals(category="Beef"), n,
+                                               lambda i: get_cache().clear())}
+    out["filter[category+area network]"] = measure(
+        lambda i, _: api.filter_meals(category="Beef", area="British"), n, lambda i: get_cache().clear())
+    engine = filters.FilterEngine()
+    engine.warm(["Beef", "Pork", "Chicken"], ["British", "French"])
+    out["filter[multi, warm engine]"] = measure(
+        lambda i, _: engine.filter(["Beef", "Pork", "Chicken"], ["British", "French"]), n)
+    return out
+
+
+def scenario_detail(server, n):
+    ids = [m["idMeal"] for m in server.meals]
+    out = {"detail[network]": measure(lambda i, _: Recipe.from_dict(api.get_meal_by_id(ids[i % len(ids)])), n,
+                                      lambda i: get_cache().clear())}
+    api.get_meal_by_id(ids[0])
+    out["detail[cached]"] = measure(lambda i, _: Recipe.from_dict(api.get_meal_by_id(ids[0])), n)
+    return out
+
+
+def scenario_image(server, n):
+    url = server.meals[0]["strMealThumb"]
+    out = {}
+    for fast in (False, True):
+        label = "fast" if fast else "lanczos"
+        out[f"image[cold {label}]"] = measure(
+            lambda i, _: image_cache.load_thumbnail(f"{url}?v={label}{i}", fast=fast), n)
+    image_cache.load_thumbnail(url)
+    out["image[disk cache]"] = measure(lambda i, _: image_cache.load_thumbnail(url), n)
+    return out
+
+
+def scenario_favorites(server, n):
+    out = {}
+    template = server.meals
+    for size in FAVORITE_SIZES:
+        folder = os.path.join(WORKDIR, f"fav-{size}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, "favorites.json")
+        with open(path, "w", encoding="utf-8") as f:
+            records = []
+            for k in range(size):
+                r = Recipe.from_api(template[k % len(template)])
+                r.id = str(100000 + k)
+                records.append(r.to_dict())
+            json.dump(records, f)
+        label = f"{size // 1000}k" if size >= 1000 else str(size)
+        out[f"favorites[load {label}]"] = measure(lambda i, _: utils.FavoritesStore(path), max(3, n // 5))
+        store = utils.FavoritesStore(path)
+        meal = dict(template[0])
+
+        def add_remove(i, _):
+            meal["idMeal"] = f"new-{i}"
+            store.add(meal)
+            store.remove(meal["idMeal"])
+
+        out[f"favorites[add+remove {label}]"] = measure(add_remove, n)
+        out[f"favorites[contains {label}]"] = measure(lambda i, _: store.contains(str(100000 + i % size)), n)
+    return out
+
+
+def scenario_pantry(server, n):
+    recipes = [Recipe.from_api(m) for m in server.meals]
+    out = {f"pantry[build {len(recipes)}]": measure(lambda i, _: pantry.PantryIndex(recipes), max(3, n // 5))}
+    index = pantry.PantryIndex(recipes)
+    items = ["chicken", "ginger", "garlic", "rice", "onion", "salt", "pepper", "butter"]
+    out[f"pantry[match {len(recipes)}]"] = measure(lambda i, _: index.match(items[:3 + i % 6]), n)
+    return out
+
+
+SCENARIOS = {
+    "cold_start": scenario_cold_start,
+    "search": scenario_search,
+    "filter": scenario_filter,
+    "detail": scenario_detail,
+    "image": scenario_image,
+    "favorites": scenario_favorites,
+    "pantry": scenario_pantry,
+}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MealFinder headless benchmarks")
+    ap.add_argument("-n", "--iterations", type=int, default=30)
+    ap.add_argument("-k", "--only", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    ap.add_argument("--latency", type=float, default=20.0, help="fake server latency, ms")
+    ap.add_argument("--meals", type=int, default=300, help="fake catalog size")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    server = FakeMealDB(count=args.meals, latency_ms=args.latency).start()
+    api.API_BASE = server.base
+    results = {}
+    try:
+        for name in args.only or SCENARIOS:
+            results.update(SCENARIOS[name](server, args.iterations))
+    finally:
+        server.stop()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+    width = max(len(k) for k in results)
+    print(f"{'scenario'.ljust(width)}  {'n':>4}  {'p50':>9}  {'p95':>9}  {'p99':>9}   (ms, latency={args.latency:g}ms)")
+    for name, r in results.items():
+        print(f"{name.ljust(width)}  {r['n']:>4}  {r['p50']:>9.3f}  {r['p95']:>9.3f}  {r['p99']:>9.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
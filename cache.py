@@ -0,0 +1,168 @@
+# cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# папка для всех локальных кэшей (ответы API, картинки и т.д.)
+CACHE_DIR = os.environ.get("MEALFINDER_CACHE_DIR", ".mealfinder_cache")
+
+# сколько секунд ответ считается свежим; 0 = не кэшировать
+DEFAULT_TTL = 24 * 3600
+ENDPOINT_TTL = {
+    "categories.php": 7 * 24 * 3600,
+    "list.php": 7 * 24 * 3600,
+    "lookup.php": 7 * 24 * 3600,
+    "filter.php": 24 * 3600,
+    "search.php": 6 * 3600,
+    "random.php": 0,
+}
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+TOUCH_INTERVAL = 60  # не обновляем accessed_at чаще, чем раз в минуту
+
+
+def make_key(endpoint, params=None):
+    if not params:
+        return endpoint
+    return endpoint + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+
+class ResponseCache:
+    """Постоянный кэш ответов API в SQLite: TTL по эндпоинтам, LRU-вытеснение по размеру,
+    stale-while-revalidate (устаревшее значение отдаётся сразу, обновление идёт в фоне)."""
+
+    def __init__(self, path=None, max_bytes=MAX_CACHE_BYTES, ttl=None):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "responses.sqlite3")
+        self.max_bytes = max_bytes
+        self.ttl = dict(ENDPOINT_TTL, **(ttl or {}))
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._bg = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, endpoint TEXT, value TEXT,"
+            " size INTEGER, fetched_at REAL, accessed_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(accessed_at)")
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def ttl_for(self, endpoint):
+        return self.ttl.get(endpoint, DEFAULT_TTL)
+
+    # ---------------- low-level ----------------
+    def peek(self, key):
+        """Возвращает (value, fetched_at) или None — без учёта TTL."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, fetched_at, accessed_at FROM entries WHERE key=?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] > TOUCH_INTERVAL:
+                self._db.execute("UPDATE entries SET accessed_at=? WHERE key=?", (now, key))
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, endpoint, value):
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        size = len(raw.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key=?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries(key, endpoint, value, size, fetched_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, raw, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # удаляем самые давно использованные записи, пока не уложимся в 90% лимита
+        target = self.max_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._total <= target:
+                break
+            doomed.append((key,))
+            self._total -= size
+        self._db.executemany("DELETE FROM entries WHERE key=?", doomed)
+
+    def values(self, endpoint):
+        """Все сохранённые ответы эндпоинта (без учёта TTL и без обновления LRU)."""
+        with self._lock:
+            rows = self._db.execute("SELECT value FROM entries WHERE endpoint=?", (endpoint,)).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._total = 0
+
+    # ---------------- read-through ----------------
+    def get_or_fetch(self, endpoint, params, fetch):
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return fetch()
+        key = make_key(endpoint, params)
+        cached = self.peek(key)
+        if cached is not None:
+            value, fetched_at = cached
+            if time.time() - fetched_at < ttl:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, endpoint, fetch)
+            return value
+        self.misses += 1
+        value = fetch()
+        self.put(key, endpoint, value)
+        return value
+
+    def _refresh_in_background(self, key, endpoint, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def task():
+            try:
+                self.put(key, endpoint, fetch())
+            except Exception:
+                pass  # нет сети — продолжаем отдавать устаревшее значение
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._bg.submit(task)
+
+    def stats(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {"entries": count, "bytes": self._total, "hits": self.hits,
+                    "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+# ---------------- shared instance ----------------
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
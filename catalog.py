@@ -0,0 +1,242 @@
+# catalog.py
+import json
+import os
+import re
+import sqlite3
+import string
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import CACHE_DIR
+from models import parse_ingredients
+
+CATALOG_FILE = os.path.join(CACHE_DIR, "catalog.sqlite3")
+
+# вес поля в ранжировании
+FIELD_WEIGHTS = {"name": 5.0, "ingredient": 3.0, "tag": 2.0, "category": 1.5, "area": 1.5}
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def meal_ingredients(meal):
+    return [ing for ing, _ in parse_ingredients(meal)]
+
+
+class Catalog:
+    """Локальное зеркало всего каталога TheMealDB + инвертированный индекс в памяти."""
+
+    def __init__(self, path=CATALOG_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meals (id TEXT PRIMARY KEY, data TEXT, updated_at REAL)"
+        )
+        self.meals = {}
+        self._index = defaultdict(dict)         # token -> {meal_id: score}
+        self._ing_index = defaultdict(set)      # token ингредиента -> {meal_id}
+        self._meal_tokens = {}                  # meal_id -> (токены, токены ингредиентов)
+        self._terms = []                        # отсортированные токены для поиска по префиксу
+        self._terms_dirty = False
+        for _, data in self._db.execute("SELECT id, data FROM meals"):
+            self._index_meal(json.loads(data))
+        self._terms = sorted(self._index)
+
+    def __len__(self):
+        return len(self.meals)
+
+    # ---------------- indexing ----------------
+    def _index_meal(self, meal):
+        meal_id = meal.get("idMeal")
+        if not meal_id:
+            return
+        if meal_id in self.meals:
+            self._unindex(meal_id)
+        self.meals[meal_id] = meal
+        tokens, ing_tokens = set(), set()
+        fields = [("name", meal.get("strMeal")), ("category", meal.get("strCategory")),
+                  ("area", meal.get("strArea"))]
+        fields += [("tag", t) for t in (meal.get("strTags") or "").split(",")]
+        for ing in meal_ingredients(meal):
+            fields.append(("ingredient", ing))
+            for tok in tokenize(ing):
+                self._ing_index[tok].add(meal_id)
+                ing_tokens.add(tok)
+        for field, text in fields:
+            weight = FIELD_WEIGHTS[field]
+            for tok in tokenize(text):
+                postings = self._index[tok]
+                postings[meal_id] = postings.get(meal_id, 0.0) + weight
+                tokens.add(tok)
+        self._meal_tokens[meal_id] = (tokens, ing_tokens)
+        self._terms_dirty = True
+
+    def _unindex(self, meal_id):
+        tokens, ing_tokens = self._meal_tokens.pop(meal_id, ((), ()))
+        for tok in tokens:
+            postings = self._index.get(tok)
+            if postings is not None:
+                postings.pop(meal_id, None)
+                if not postings:
+                    del self._index[tok]
+        for tok in ing_tokens:
+            ids = self._ing_index.get(tok)
+            if ids is not None:
+                ids.discard(meal_id)
+                if not ids:
+                    del self._ing_index[tok]
+        self.meals.pop(meal_id, None)
+        self._terms_dirty = True
+
+    def add_meals(self, meals):
+        """Добавляет/обновляет полные записи (например, после lookup.php)."""
+        meals = [m for m in (meals or []) if m and m.get("idMeal")]
+        if not meals:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meals(id, data, updated_at) VALUES (?, ?, ?)",
+                [(m["idMeal"], json.dumps(m, ensure_ascii=False, separators=(",", ":")), now)
+                 for m in meals],
+            )
+            self._db.execute("COMMIT")
+            for m in meals:
+                self._index_meal(m)
+        return len(meals)
+
+    # ---------------- search ----------------
+    def _expand(self, token):
+        # точное совпадение + все токены с таким префиксом
+        if self._terms_dirty:
+            self._terms = sorted(self._index)
+            self._terms_dirty = False
+        i = bisect_left(self._terms, token)
+        out = []
+        while i < len(self._terms) and self._terms[i].startswith(token):
+            out.append(self._terms[i])
+            i += 1
+        return out
+
+    def search(self, text, limit=None):
+        """Все совпадения по имени/ингредиентам/тегам/категории/стране, по убыванию релевантности."""
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        with self._lock:
+            scores = None
+            for tok in tokens:
+                tok_scores = {}
+                for term in self._expand(tok):
+                    bonus = 1.0 if term == tok else 0.5
+                    for meal_id, score in self._index[term].items():
+                        tok_scores[meal_id] = max(tok_scores.get(meal_id, 0.0), score * bonus)
+                if scores is None:
+                    scores = tok_scores
+                else:
+                    scores = {k: v + tok_scores[k] for k, v in scores.items() if k in tok_scores}
+                if not scores:
+                    return []
+            ranked = sorted(scores, key=lambda k: (-scores[k], self.meals[k].get("strMeal", "")))
+            if limit:
+                ranked = ranked[:limit]
+            return [self.meals[k] for k in ranked]
+
+    def with_ingredients(self, ingredients):
+        """Блюда, в которых есть ВСЕ перечисленные ингредиенты ("chicken", "ginger", ...)."""
+        with self._lock:
+            result = None
+            for ing in ingredients:
+                ids = None
+                for tok in tokenize(ing):
+                    tok_ids = self._ing_index.get(tok, set())
+                    ids = set(tok_ids) if ids is None else ids & tok_ids
+                if ids is None:
+                    continue
+                result = ids if result is None else result & ids
+                if not result:
+                    return []
+            if not result:
+                return []
+            return sorted((self.meals[k] for k in result), key=lambda m: m.get("strMeal", ""))
+
+    def query(self, text):
+        # "has chicken AND ginger" / "has chicken, ginger" -> поиск по ингредиентам
+        stripped = (text or "").strip()
+        if stripped.lower().startswith("has "):
+            parts = re.split(r"\s+and\s+|,|&", stripped[4:], flags=re.IGNORECASE)
+            return self.with_ingredients([p for p in parts if p.strip()])
+        return self.search(stripped)
+
+    # ---------------- sync ----------------
+    def sync(self, fetch_json, letters=string.ascii_lowercase + string.digits, workers=4, progress=None):
+        """Загружает весь каталог через search.php?f=<буква>. fetch_json(endpoint, params) -> dict."""
+        def fetch_letter(letter):
+            try:
+                data = fetch_json("search.php", {"f": letter})
+            except Exception:
+                return letter, None
+            return letter, (data or {}).get("meals") or []
+
+        total = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for letter, meals in pool.map(fetch_letter, letters):
+                if meals is None:
+                    failed.append(letter)
+                    continue
+                total += self.add_meals(meals)
+                if progress:
+                    progress(letter, len(meals))
+        return total, failed
+
+
+# ---------------- shared instance ----------------
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = Catalog()
+    return _catalog
+
+
+def main(argv):
+    # python catalog.py sync | python catalog.py search "has chicken AND ginger"
+    if not argv or argv[0] not in ("sync", "search"):
+        print("usage: python catalog.py sync | search <query>")
+        return 2
+    catalog = get_catalog()
+    if argv[0] == "sync":
+        from api import _fetch_json
+        start = time.perf_counter()
+        total, failed = catalog.sync(_fetch_json, progress=lambda l, n: print(f"  {l}: {n}"))
+        print(f"synced {total} meals ({len(catalog)} in catalog) in {time.perf_counter() - start:.1f}s")
+        if failed:
+            print("failed letters:", "".join(failed))
+            return 1
+        return 0
+    start = time.perf_counter()
+    results = catalog.query(" ".join(argv[1:]))
+    elapsed = (time.perf_counter() - start) * 1000
+    for m in results:
+        print(f"{m['idMeal']}\t{m.get('strMeal')}\t{m.get('strCategory')} / {m.get('strArea')}")
+    print(f"{len(results)} results in {elapsed:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,260 @@
+# cli.py
+# Пакетные задачи без GUI: выгрузка рецептов в JSON Lines и прогрев кэшей.
+#
+#   python cli.py export -c Beef,Chicken -a Italian -o meals.jsonl --images images/ -j 8
+#   python cli.py export --ids 52772,52773 --ids-file more.txt -o meals.jsonl --raw
+#   python cli.py warm -c Seafood --favorites      # кэш ответов + миниатюры + каталог, без вывода
+#
+# Категории объединяются, страны объединяются, между собой — пересечение (как фильтр в окне);
+# --ids / --ids-file / --favorites добавляются к результату. Записи пишутся по мере готовности
+# (порядок — порядок завершения). Повторный запуск с тем же -o продолжает с места остановки:
+# id, уже записанные в файл, пропускаются, оборванная последняя строка отбрасывается.
+# Сводка (записей/с, байты, попадания в кэш) печатается в stderr, чтобы не мешать выводу в stdout.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_JOBS = 8
+CATALOG_BATCH = 100
+
+
+def split_list(values):
+    # -c Beef,Chicken -c Dessert -> ["Beef", "Chicken", "Dessert"]
+    out = []
+    for value in values or ():
+        out += [v.strip() for v in value.split(",") if v.strip()]
+    return out
+
+def read_ids_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def resume_state(path):
+    """id, уже записанные в path; оборванная последняя строка обрезается."""
+    done = set()
+    if not path or path == "-" or not os.path.exists(path):
+        return done
+    good = 0
+    with open(path, "rb+") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break
+            meal_id = rec.get("id") or rec.get("idMeal")
+            if meal_id:
+                done.add(str(meal_id))
+            good += len(line)
+        f.truncate(good)
+    return done
+
+def resolve_ids(categories=(), areas=(), ids=(), favorites=False):
+    from filters import get_filter_engine
+    from utils import load_favorites
+    out = []
+    if categories or areas:
+        out += [m["idMeal"] for m in get_filter_engine().filter(categories, areas)]
+    out += [str(i) for i in ids]
+    if favorites:
+        out += [r.id for r in load_favorites()]
+    return list(dict.fromkeys(out))
+
+
+class BatchJob:
+    """Параллельная загрузка полных записей по id с ограничением jobs одновременных задач.
+
+    В очереди пула не больше 2*jobs задач, поэтому память не растёт со списком id.
+    Пишет только главный поток: строка уходит в вывод, как только готова её запись.
+    """
+
+    def __init__(self, ids, out=None, images=None, thumbs=False, raw=False, catalog=False, jobs=DEFAULT_JOBS):
+        self.ids = ids
+        self.out = out
+        self.images = images
+        self.thumbs = thumbs
+        self.raw = raw
+        self.catalog = catalog
+        self.jobs = max(1, jobs)
+        self.stats = {"records": 0, "skipped": 0, "failed": 0, "out_bytes": 0, "image_bytes": 0}
+        self.failed_ids = []
+        self.interrupted = False
+
+    def fetch_one(self, meal_id):
+        from api import get_meal_by_id
+        from models import Recipe
+        meal = get_meal_by_id(meal_id)
+        if not meal:
+            raise LookupError(meal_id)
+        record = meal if self.raw else Recipe.from_dict(meal).to_dict()
+        thumb = meal.get("strMealThumb")
+        image_bytes = 0
+        if self.images and thumb:
+            path = os.path.join(self.images, f"{meal_id}.jpg")
+            if not os.path.exists(path):  # после перезапуска уже скачанное не качаем
+                from http_client import get_client
+                data = get_client().get_bytes(thumb)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                image_bytes = len(data)
+            record = dict(record, image=path)
+        if self.thumbs and thumb:
+            from image_cache import load_thumbnail
+            load_thumbnail(thumb)
+        return meal, record, image_bytes
+
+    def run(self):
+        done = resume_state(self.out)
+        todo = [i for i in self.ids if i not in done]
+        self.stats["skipped"] = len(self.ids) - len(todo)
+        if self.images:
+            os.makedirs(self.images, exist_ok=True)
+        if self.out == "-":
+            sink = sys.stdout.buffer
+        elif self.out:
+            sink = open(self.out, "ab")
+        else:
+            sink = None
+        to_catalog = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="cli") as pool:
+                pending = {}
+                it = iter(todo)
+
+                def refill():
+                    while len(pending) < self.jobs * 2:
+                        meal_id = next(it, None)
+                        if meal_id is None:
+                            return
+                        pending[pool.submit(self.fetch_one, meal_id)] = meal_id
+
+                refill()
+                try:
+                    while pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            meal_id = pending.pop(fut)
+                            try:
+                                meal, record, image_bytes = fut.result()
+                            except Exception:
+                                self.stats["failed"] += 1
+                                self.failed_ids.append(meal_id)
+                                continue
+                            self.stats["records"] += 1
+                            self.stats["image_bytes"] += image_bytes
+                            if sink is not None:
+                                line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+                                sink.write(line)
+                                sink.flush()
+                                self.stats["out_bytes"] += len(line)
+                            if self.catalog:
+                                to_catalog.append(meal)
+                                if len(to_catalog) >= CATALOG_BATCH:
+                                    self._store_catalog(to_catalog)
+                                    to_catalog = []
+                        refill()
+                except KeyboardInterrupt:
+                    # уже запущенные задачи доработают, остальные — нет; файл остаётся целым
+                    self.interrupted = True
+                    for fut in pending:
+                        fut.cancel()
+        finally:
+            if to_catalog:
+                self._store_catalog(to_catalog)
+            if sink is not None and sink is not sys.stdout.buffer:
+                sink.close()
+        return self.stats
+
+    def _store_catalog(self, meals):
+        from catalog import get_catalog
+        get_catalog().add_meals(meals)
+
+
+def _human_bytes(n):
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+def print_summary(name, job, elapsed, cache_before, image_hits_before):
+    from api import get_cache_stats
+    from image_cache import get_disk_cache
+    s = job.stats
+    cache = get_cache_stats()
+    hits = cache["hits"] + cache["stale_hits"] - cache_before["hits"] - cache_before["stale_hits"]
+    misses = cache["misses"] - cache_before["misses"]
+    rate = s["records"] / elapsed if elapsed > 0 else 0.0
+    err = sys.stderr
+    print(f"{name}: {s['records']} records, {s['skipped']} already done, {s['failed']} failed "
+          f"in {elapsed:.1f}s ({rate:.1f} records/s)", file=err)
+    print(f"bytes: {_human_bytes(s['out_bytes'])} JSONL, {_human_bytes(s['image_bytes'])} images", file=err)
+    lookups = hits + misses
+    share = f" ({hits / lookups:.0%})" if lookups else ""
+    print(f"API cache: {hits} hits, {misses} misses{share}; "
+          f"thumbnail cache: {get_disk_cache().hits - image_hits_before} hits", file=err)
+    if job.failed_ids:
+        print(f"failed ids: {', '.join(job.failed_ids[:20])}{' …' if len(job.failed_ids) > 20 else ''}", file=err)
+    if job.interrupted:
+        print("interrupted — run the same command again to continue", file=err)
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="MealFinder batch jobs (no GUI)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    for name, help_text in (("export", "write full recipes as JSON Lines"),
+                            ("warm", "fill response/thumbnail caches and the local catalog")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("-c", "--category", action="append", help="category (comma-separated, repeatable)")
+        p.add_argument("-a", "--area", action="append", help="area (comma-separated, repeatable)")
+        p.add_argument("--ids", action="append", help="meal ids (comma-separated, repeatable)")
+        p.add_argument("--ids-file", help="file with one meal id per line")
+        p.add_argument("--favorites", action="store_true", help="also include all favorites")
+        p.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help="parallel requests")
+        if name == "export":
+            p.add_argument("-o", "--output", default="-", help="JSONL file (resumable) or - for stdout")
+            p.add_argument("--images", help="also download original thumbnails into this folder")
+            p.add_argument("--raw", action="store_true", help="raw TheMealDB dicts instead of compact records")
+            p.add_argument("--thumbs", action="store_true", help="also warm the resized thumbnail cache")
+            p.add_argument("--catalog", action="store_true", help="also store records in the local catalog")
+    return ap
+
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    # лимит одновременных соединений общего HTTP-клиента читается при импорте http_client
+    os.environ.setdefault("MEALFINDER_MAX_CONCURRENCY", str(max(1, args.jobs)))
+    from api import get_cache_stats
+    from image_cache import get_disk_cache
+
+    ids = split_list(args.ids)
+    if args.ids_file:
+        ids += read_ids_file(args.ids_file)
+    ids = resolve_ids(split_list(args.category), split_list(args.area), ids, args.favorites)
+    if not ids:
+        print("nothing to do: no ids matched (check -c/-a/--ids)", file=sys.stderr)
+        return 2
+
+    if args.command == "export":
+        job = BatchJob(ids, out=args.output, images=args.images, thumbs=args.thumbs, raw=args.raw,
+                       catalog=args.catalog, jobs=args.jobs)
+    else:
+        job = BatchJob(ids, thumbs=True, catalog=True, jobs=args.jobs)
+    cache_before = get_cache_stats()
+    image_hits_before = get_disk_cache().hits
+    start = time.perf_counter()
+    job.run()
+    print_summary(args.command, job, time.perf_counter() - start, cache_before, image_hits_before)
+    if job.interrupted:
+        return 130
+    return 1 if job.failed_ids else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+# debug_view.py
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from api import get_cache_stats, get_latency_stats
+from image_cache import get_disk_cache
+from tracing import HISTOGRAM_BOUNDS, get_tracer
+from ui_common import BG, PANEL, CARD, TEXT, MUTED, set_readonly_text
+
+REFRESH_MS = 1000
+BARS = " ▁▂▃▄▅▆▇█"
+
+
+def sparkline(counts):
+    top = max(counts) or 1
+    return "".join(BARS[0 if not c else max(1, round(c / top * (len(BARS) - 1)))] for c in counts)
+
+def hit_rate(hits, misses):
+    total = hits + misses
+    return f"{hits / total:6.1%} ({hits}/{total})" if total else "     — (0/0)"
+
+
+class DebugView:
+    """Скрытая вкладка "Debug": интервалы из tracing, гистограммы, попадания в кэши.
+
+    Открывается по Ctrl+Shift+D (или сразу при MEALFINDER_DEBUG=1); пока вкладка
+    не выбрана, ничего не пересчитывается.
+    """
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self._after = None
+
+        top = tk.Frame(parent, bg=PANEL, padx=12, pady=8)
+        top.pack(fill="x")
+        tk.Label(top, text="Производительность", bg=PANEL, fg=TEXT, font=("Segoe UI", 16, "bold")).pack(side="left")
+        ttk.Button(top, text="Очистить", command=self.on_clear).pack(side="right", padx=(6,0))
+        ttk.Button(top, text="Chrome trace…", command=lambda: self.on_export(".json")).pack(side="right", padx=(6,0))
+        ttk.Button(top, text="JSONL…", command=lambda: self.on_export(".jsonl")).pack(side="right", padx=(6,0))
+
+        legend = "гистограмма, мс: " + " ".join(f"≤{b}" for b in HISTOGRAM_BOUNDS) + " >"
+        tk.Label(parent, text=legend, bg=BG, fg=MUTED, anchor="w").pack(fill="x", padx=12, pady=(6,0))
+
+        self.text = tk.Text(parent, wrap="none", bg=CARD, fg=TEXT, bd=0, font=("Consolas", 10))
+        vsb = ttk.Scrollbar(parent, orient="vertical", command=self.text.yview)
+        self.text.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y", pady=12)
+        self.text.pack(fill="both", expand=True, padx=12, pady=12)
+
+    # ---------------- live refresh ----------------
+    def start(self):
+        if self._after is None:
+            self.refresh()
+
+    def stop(self):
+        if self._after is not None:
+            self.parent.after_cancel(self._after)
+            self._after = None
+
+    def refresh(self):
+        set_readonly_text(self.text, self.render())
+        self._after = self.parent.after(REFRESH_MS, self.refresh)
+
+    def render(self):
+        lines = ["ИНТЕРВАЛЫ (p50/p95/max, мс)"]
+        summary = get_tracer().summary()
+        width = max([len(n) for n in summary] + [10])
+        for name in sorted(summary, key=lambda n: (summary[n]["cat"], n)):
+            s = summary[name]
+            err = f"  ошибок: {s['errors']}" if s["errors"] else ""
+            lines.append(f"{s['cat']:<6} {name:<{width}} {s['count']:>6}  {s['p50']:>8.2f} {s['p95']:>8.2f} "
+                         f"{s['max']:>8.2f}  {sparkline(s['hist'])}{err}")
+
+        cache = get_cache_stats()
+        disk = get_disk_cache()
+        mem = self.app._image_cache
+        lines += ["", "КЭШИ (попадания)",
+                  f"ответы API     {hit_rate(cache['hits'] + cache['stale_hits'], cache['misses'])}"
+                  f"  устаревших: {cache['stale_hits']}  записей: {cache['entries']}  {cache['bytes'] // 1024} КБ",
+                  f"картинки, диск {hit_rate(disk.hits, disk.misses)}",
+                  f"PhotoImage LRU {hit_rate(mem.hits, mem.misses)}"]
+
+        lines += ["", "HTTP (запросов / ошибок / среднее / max, мс)"]
+        for endpoint, d in sorted(get_latency_stats().items()):
+            lines.append(f"{endpoint:<16} {d['count']:>6} {d['errors']:>6} {d['avg'] * 1000:>9.1f} {d['max'] * 1000:>9.1f}")
+
+        lines += ["", f"очередь пула: {self.app.scheduler.queue_depth()}"]
+        return "\n".join(lines)
+
+    # ---------------- actions ----------------
+    def on_export(self, ext):
+        kinds = {".json": ("Chrome trace", "*.json"), ".jsonl": ("JSON Lines", "*.jsonl")}
+        path = filedialog.asksaveasfilename(defaultextension=ext, filetypes=[kinds[ext]],
+                                            initialfile="mealfinder-trace" + ext)
+        if not path:
+            return
+        try:
+            get_tracer().export(path)
+        except OSError as e:
+            messagebox.showerror("Экспорт", str(e))
+
+    def on_clear(self):
+        get_tracer().clear()
+        set_readonly_text(self.text, self.render())
@@ -0,0 +1,242 @@
+# favorites_view.py
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from ui_common import BG, PANEL, CARD, PRIMARY, TEXT, MUTED, DANGER, scrollable_frame, set_readonly_text
+from utils import export_favorites, get_store, import_favorites, load_favorites, remove_many_from_favorites
+
+
+class FavoritesView:
+    """Вкладка "Избранное": список слева, подробности справа.
+
+    Создаётся при первом открытии вкладки — до этого избранное не читается с диска.
+    """
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.favs = []
+        self.shown_id = None
+        self._build_left()
+        self._build_detail()
+
+    # ---------------- FAVORITES TAB ----------------
+    def _build_left(self):
+        fav_left = tk.Frame(self.parent, bg=PANEL, width=320, padx=12, pady=12)
+        fav_left.pack(side="left", fill="y")
+
+        tk.Label(fav_left, text="Избранное", bg=PANEL, fg=TEXT, font=("Segoe UI", 20, "bold")).pack(anchor="w", pady=(0,8))
+        tk.Label(fav_left, text="Список сохранённых блюд", bg=PANEL, fg=MUTED).pack(anchor="w", pady=(0,12))
+
+        # extended: Shift/Ctrl+клик — несколько блюд сразу (удаление пачкой)
+        self.listbox = tk.Listbox(fav_left, bg=CARD, fg=TEXT, width=40, height=30, selectbackground=PRIMARY,
+                                  selectmode="extended")
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<<ListboxSelect>>", self.on_list_select)
+
+        # Buttons under list
+        btn_frame = tk.Frame(fav_left, bg=PANEL)
+        btn_frame.pack(fill="x", pady=(8,0))
+        open_btn = ttk.Button(btn_frame, text="Открыть", command=self.left_open)
+        del_btn = ttk.Button(btn_frame, text="Удалить", command=self.left_delete)
+        self.compact_var = tk.BooleanVar(value=False)  # False = Full view, True = Compact (compact = like mobile)
+        view_toggle = ttk.Checkbutton(btn_frame, text="Compact view (мобильный)", variable=self.compact_var)
+
+        open_btn.pack(side="left", fill="x", expand=True, padx=(0,6))
+        del_btn.pack(side="left", fill="x", expand=True, padx=(0,6))
+        view_toggle.pack(side="left", fill="x")
+
+        # JSON Lines: по одной записи на строку
+        io_frame = tk.Frame(fav_left, bg=PANEL)
+        io_frame.pack(fill="x", pady=(6,0))
+        ttk.Button(io_frame, text="Импорт…", command=self.on_import).pack(side="left", fill="x", expand=True, padx=(0,6))
+        ttk.Button(io_frame, text="Экспорт…", command=self.on_export).pack(side="left", fill="x", expand=True)
+
+    # Right side in favorites: scrollable detail (same structure as main detail)
+    def _build_detail(self):
+        right_container = tk.Frame(self.parent, bg=BG)
+        right_container.pack(side="left", fill="both", expand=True, padx=12, pady=12)
+
+        self.canvas, frame = scrollable_frame(right_container)
+
+        # inside frame: image block + info
+        image_block = tk.Frame(frame, bg=BG)
+        image_block.pack(anchor="nw", pady=(6,12))
+
+        self.img_label = tk.Label(image_block, bg=BG)
+        self.img_label.pack()
+        self.open_btn = tk.Button(image_block, text="Открыть рецепт", bg=PRIMARY, fg="white", relief="flat")
+        self.open_btn.pack(pady=(8,6))
+        self.delete_btn = tk.Button(image_block, text="Удалить из избранного", bg=DANGER, fg="white", relief="flat")
+        self.delete_btn.pack()
+
+        self.title_label = tk.Label(frame, text="", bg=BG, fg=TEXT, font=("Segoe UI", 18, "bold"), anchor="w")
+        self.title_label.pack(anchor="nw", pady=(6,4))
+        self.meta_label = tk.Label(frame, text="", bg=BG, fg=MUTED, font=("Segoe UI", 10), anchor="w")
+        self.meta_label.pack(anchor="nw", pady=(0,12))
+
+        self.ing_label = tk.Label(frame, text="Ингредиенты:", bg=BG, fg=TEXT)
+        self.ing_label.pack(anchor="nw")
+        self.ing_text = tk.Text(frame, height=8, wrap="word", bg=CARD, fg=TEXT, bd=0)
+        self.ing_scroll = ttk.Scrollbar(frame, orient="vertical", command=self.ing_text.yview)
+        self.ing_text.configure(yscrollcommand=self.ing_scroll.set)
+        self.ing_scroll.pack(side="right", fill="y")
+        self.ing_text.pack(fill="both", padx=(0,0), pady=(0,8))
+
+        self.instr_label = tk.Label(frame, text="Инструкция:", bg=BG, fg=TEXT)
+        self.instr_label.pack(anchor="nw")
+        self.instr_text = tk.Text(frame, height=12, wrap="word", bg=CARD, fg=TEXT, bd=0)
+        self.instr_scroll = ttk.Scrollbar(frame, orient="vertical", command=self.instr_text.yview)
+        self.instr_text.configure(yscrollcommand=self.instr_scroll.set)
+        self.instr_scroll.pack(side="right", fill="y")
+        self.instr_text.pack(fill="both", pady=(0,8))
+
+    # ---------------- Favorites logic ----------------
+    def populate(self):
+        self.favs = load_favorites() or []
+        self.listbox.delete(0, tk.END)
+        for m in self.favs:
+            self.listbox.insert(tk.END, m.name or "—")
+
+        # clear right details
+        self.clear_detail()
+
+    def apply_changes(self, changed):
+        """Точечное обновление после правок из другого процесса: трогаются только строки из changed."""
+        store = get_store()
+        for idx in range(len(self.favs) - 1, -1, -1):
+            meal_id = self.favs[idx].id
+            if meal_id not in changed:
+                continue
+            recipe = store.get(meal_id)
+            self.listbox.delete(idx)
+            if recipe is None:
+                del self.favs[idx]
+            else:
+                self.favs[idx] = recipe
+                self.listbox.insert(idx, recipe.name or "—")
+        known = {m.id for m in self.favs}
+        fresh = {meal_id for meal_id in changed if meal_id not in known and store.contains(meal_id)}
+        if fresh:
+            # новые записи — в конец, в порядке хранилища
+            for recipe in store.all():
+                if recipe.id in fresh:
+                    self.favs.append(recipe)
+                    self.listbox.insert(tk.END, recipe.name or "—")
+        if self.shown_id in changed:
+            recipe = store.get(self.shown_id)
+            if recipe is None:
+                self.clear_detail()
+            else:
+                self.show_detail(recipe)
+
+    def clear_detail(self):
+        self.shown_id = None
+        self.img_label.config(image="")
+        self.img_label.image = None
+        self.title_label.config(text="")
+        self.meta_label.config(text="")
+        set_readonly_text(self.ing_text, "")
+        set_readonly_text(self.instr_text, "")
+
+    def selected_all(self):
+        return [self.favs[i] for i in self.listbox.curselection() if i < len(self.favs)]
+
+    def selected(self):
+        meals = self.selected_all()
+        return meals[0] if meals else None
+
+    def on_list_select(self, evt):
+        meal = self.selected()
+        if meal:
+            self.show_detail(meal)
+
+    def show_detail(self, meal):
+        self.shown_id = meal.id
+        self.title_label.config(text=meal.name or "—")
+        self.meta_label.config(text=meal.meta_text())
+        # ingredients & instructions
+        set_readonly_text(self.ing_text, "\n".join(meal.ingredient_lines()))
+        set_readonly_text(self.instr_text, meal.instructions)
+
+        # image async
+        def set_image(tkimg):
+            if tkimg is None:
+                return
+            self.img_label.config(image=tkimg)
+            self.img_label.image = tkimg
+        self.app.fetch_image_tk(meal.thumb, set_image, channel="fav-image", meal_id=meal.id)
+
+        # button actions
+        self.open_btn.config(command=lambda: self.app.open_meal(meal.id))
+        self.delete_btn.config(command=lambda: self.confirm_delete([meal], f"Удалить {meal.name} из избранного?"))
+
+        # compact: hide ing/instr if compact True
+        if self.compact_var.get():
+            for w in (self.ing_text, self.ing_scroll, self.ing_label,
+                      self.instr_text, self.instr_scroll, self.instr_label):
+                w.pack_forget()
+        else:
+            # ensure packed
+            self.ing_label.pack(anchor="nw")
+            self.ing_scroll.pack(side="right", fill="y")
+            self.ing_text.pack(fill="both", padx=(0,0), pady=(0,8))
+            self.instr_label.pack(anchor="nw")
+            self.instr_scroll.pack(side="right", fill="y")
+            self.instr_text.pack(fill="both", pady=(0,8))
+
+    def confirm_delete(self, meals, question):
+        if messagebox.askyesno("Удалить", question):
+            remove_many_from_favorites([m.id for m in meals])
+            self.app.favorites_changed()
+
+    # open/delete buttons on left for convenience
+    def left_open(self):
+        meal = self.selected()
+        if meal:
+            self.show_detail(meal)
+
+    def left_delete(self):
+        meals = self.selected_all()
+        if len(meals) == 1:
+            self.confirm_delete(meals, f"Удалить {meals[0].name}?")
+        elif meals:
+            self.confirm_delete(meals, f"Удалить выбранные блюда ({len(meals)})?")
+
+    # ---------------- import / export ----------------
+    def on_export(self):
+        path = filedialog.asksaveasfilename(defaultextension=".jsonl", initialfile="favorites.jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("Все файлы", "*.*")])
+        if not path:
+            return
+        try:
+            count = export_favorites(path)
+        except OSError as e:
+            messagebox.showerror("Экспорт", str(e))
+            return
+        messagebox.showinfo("Экспорт", f"Сохранено блюд: {count}")
+
+    def on_import(self):
+        path = filedialog.askopenfilename(filetypes=[("JSON Lines", "*.jsonl"), ("Все файлы", "*.*")])
+        if not path:
+            return
+
+        def task():
+            try:
+                stats = import_favorites(path)
+            except (OSError, ValueError) as e:  # ValueError — в т.ч. UnicodeDecodeError
+                return {"error": str(e)}
+            # импортированные блюда сразу попадают в таблицу похожих (инкрементально)
+            from similar import get_similar_index
+            get_similar_index().add(load_favorites())
+            return stats
+
+        def done(stats):
+            if "error" in stats:
+                messagebox.showerror("Импорт", stats["error"])
+                return
+            self.app.favorites_changed()
+            messagebox.showinfo("Импорт", f"Добавлено: {stats['added']}, дубликатов: {stats['duplicates']}, "
+                                          f"дозагружено: {stats['hydrated']}, с ошибкой: {stats['invalid']}")
+        self.app.run_async(task, on_done=done, key=("fav-import", path),
+                           on_error=lambda e: messagebox.showerror("Импорт", f"Импорт не удался: {e}"))
@@ -0,0 +1,79 @@
+# filters.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api import filter_meals
+
+
+class FilterEngine:
+    """Фильтрация по категориям/странам через локальные операции над множествами ID.
+
+    filter.php понимает только один параметр, поэтому для каждой категории и каждой
+    страны берём свой список (он кэшируется) и дальше считаем локально:
+    (кат1 ∪ кат2 ...) ∩ (страна1 ∪ страна2 ...).
+    """
+
+    def __init__(self, fetch=filter_meals, workers=4):
+        self._fetch = fetch
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._sets = {}     # ("c"|"a", name) -> frozenset(idMeal)
+        self._items = {}    # idMeal -> краткая запись (idMeal, strMeal, strMealThumb)
+
+    def _load(self, kind, name):
+        key = (kind, name)
+        with self._lock:
+            if key in self._sets:
+                return self._sets[key]
+        meals = self._fetch(category=name) if kind == "c" else self._fetch(area=name)
+        ids = frozenset(m["idMeal"] for m in meals if m.get("idMeal"))
+        with self._lock:
+            for m in meals:
+                if m.get("idMeal"):
+                    self._items.setdefault(m["idMeal"], m)
+            if ids:  # пустой ответ (например, нет сети) не запоминаем
+                self._sets[key] = ids
+        return ids
+
+    def warm(self, categories=(), areas=()):
+        keys = [("c", c) for c in categories] + [("a", a) for a in areas]
+        with self._lock:
+            keys = [k for k in keys if k not in self._sets]
+        if not keys:
+            return
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            list(pool.map(lambda k: self._load(*k), keys))
+
+    def ids(self, categories=(), areas=()):
+        categories = [c for c in categories if c]
+        areas = [a for a in areas if a]
+        self.warm(categories, areas)
+        result = None
+        for kind, names in (("c", categories), ("a", areas)):
+            if not names:
+                continue
+            union = set()
+            for name in names:
+                union |= self._load(kind, name)
+            result = union if result is None else result & union
+        return result or set()
+
+    def filter(self, categories=(), areas=()):
+        ids = self.ids(categories, areas)
+        with self._lock:
+            items = [self._items[i] for i in ids if i in self._items]
+        items.sort(key=lambda m: m.get("strMeal", ""))
+        return items
+
+
+# ---------------- shared instance ----------------
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_filter_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = FilterEngine()
+    return _engine
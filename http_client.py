@@ -0,0 +1,92 @@
+# http_client.py
+import os
+import random
+import threading
+import time
+
+from metrics import LatencyStats
+from tracing import span
+
+# ---------------- settings (можно переопределить через переменные окружения) ----------------
+CONNECT_TIMEOUT = float(os.environ.get("MEALFINDER_CONNECT_TIMEOUT", "4"))
+READ_TIMEOUT = float(os.environ.get("MEALFINDER_READ_TIMEOUT", "8"))
+MAX_CONCURRENCY = int(os.environ.get("MEALFINDER_MAX_CONCURRENCY", "8"))
+MAX_RETRIES = int(os.environ.get("MEALFINDER_MAX_RETRIES", "2"))
+BACKOFF_BASE = 0.25  # секунды; 0.25, 0.5, 1.0 ... + случайный jitter
+BACKOFF_MAX = 4.0
+
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class TransientHTTPError(Exception):
+    pass
+
+
+class HttpClient:
+    """Общий клиент: пул keep-alive соединений, ограничение параллельности, retry с backoff."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_retries=MAX_RETRIES):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stats = LatencyStats()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # requests импортируется при первом запросе, а не при старте окна
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._retry_errors = (TransientHTTPError, requests.ConnectionError, requests.Timeout)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "MealFinder/1.0"
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, params=None, timeout=None, endpoint=None):
+        endpoint = endpoint or url.rsplit("/", 1)[-1].split("?", 1)[0]
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                with self._slots, span(f"http {endpoint}", "net", attempt=attempt):
+                    r = self.session.get(url, params=params, timeout=timeout or self.timeout)
+                if r.status_code in RETRY_STATUSES:
+                    raise TransientHTTPError(f"HTTP {r.status_code}")
+                r.raise_for_status()
+                self.stats.record(endpoint, time.perf_counter() - start)
+                return r
+            except self._retry_errors:
+                self.stats.record(endpoint, time.perf_counter() - start, ok=False)
+                if attempt >= self.max_retries:
+                    raise
+            except Exception:
+                self.stats.record(endpoint, time.perf_counter() - start, ok=False)
+                raise
+            # экспоненциальная задержка с "full jitter"
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+            time.sleep(random.uniform(0, delay))
+            attempt += 1
+
+    def get_json(self, url, params=None, timeout=None, endpoint=None):
+        endpoint = endpoint or url.rsplit("/", 1)[-1].split("?", 1)[0]
+        r = self.get(url, params=params, timeout=timeout, endpoint=endpoint)
+        with span(f"json {endpoint}", "parse"):
+            return r.json()
+
+    def get_bytes(self, url, timeout=None, endpoint="image"):
+        return self.get(url, timeout=timeout, endpoint=endpoint).content
+
+    def close(self):
+        self.session.close()
+
+
+# ---------------- shared instance ----------------
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
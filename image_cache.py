@@ -0,0 +1,181 @@
+# image_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from cache import CACHE_DIR
+from http_client import get_client
+from tracing import traced
+
+IMAGE_SIZE = (300, 300)
+PLACEHOLDER_COLOR = (60, 60, 80, 255)
+MAX_MEMORY_BYTES = 48 * 1024 * 1024   # ~130 картинок 300x300 RGBA
+MAX_DISK_BYTES = 256 * 1024 * 1024
+# быстрый режим (по желанию): JPEG декодируется сразу в уменьшенном масштабе (draft), ресайз — BILINEAR.
+# По умолчанию выключен — LANCZOS по полному изображению, как раньше
+FAST_RESAMPLE = os.environ.get("MEALFINDER_FAST_RESAMPLE", "0") == "1"
+
+IMAGE_DIR = os.path.join(CACHE_DIR, "images")
+
+
+# ---------------- memory tier: LRU по байтам ----------------
+class ByteLRU:
+    def __init__(self, max_bytes=MAX_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, size) = self._items.popitem(last=False)
+                self.bytes -= size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ---------------- disk tier: готовые (уже уменьшенные) картинки ----------------
+class DiskImageCache:
+    def __init__(self, root=IMAGE_DIR, max_bytes=MAX_DISK_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, url, size, fast=FAST_RESAMPLE):
+        # режим ресайза входит в ключ: после переключения флага не отдаём картинки другого качества
+        mode = "fast" if fast else "hq"
+        digest = hashlib.sha1(f"{size[0]}x{size[1]}:{mode}:{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest + ".png")
+
+    @traced("image.disk_load", cat="disk")
+    def load(self, url, size, fast=FAST_RESAMPLE):
+        path = self.path_for(url, size, fast)
+        from PIL import Image
+        try:
+            with Image.open(path) as img:
+                img.load()
+                self.hits += 1
+                return img
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+    @traced("image.disk_store", cat="disk")
+    def store(self, url, size, img, fast=FAST_RESAMPLE):
+        path = self.path_for(url, size, fast)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp, format="PNG", compress_level=1)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def prune(self):
+        # удаляем самые старые файлы, пока кэш не станет меньше лимита
+        files = []
+        total = 0
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+
+# ---------------- pipeline ----------------
+_disk = None
+_disk_lock = threading.Lock()
+
+def get_disk_cache():
+    global _disk
+    if _disk is None:
+        with _disk_lock:
+            if _disk is None:
+                _disk = DiskImageCache()
+    return _disk
+
+def placeholder(size=IMAGE_SIZE):
+    from PIL import Image
+    return Image.new("RGBA", size, PLACEHOLDER_COLOR)
+
+# Этапы: fetch -> decode -> fit/resample. Всё это выполняется в рабочем потоке и
+# возвращает обычный PIL.Image; ImageTk.PhotoImage создаётся только в Tk-потоке.
+# PIL импортируется внутри функций: окно открывается, не дожидаясь загрузки Pillow.
+
+def fetch(url):
+    return get_client().get_bytes(url)
+
+@traced("image.decode", cat="image")
+def decode(data, size=IMAGE_SIZE, fast=FAST_RESAMPLE):
+    from PIL import Image
+    img = Image.open(BytesIO(data))
+    if fast and img.format == "JPEG":
+        # масштаб 1/2, 1/4, 1/8 прямо в декодере; результат не меньше запрошенного размера
+        img.draft("RGB", size)
+    return img.convert("RGBA")
+
+@traced("image.resample", cat="image")
+def fit(img, size=IMAGE_SIZE, fast=FAST_RESAMPLE):
+    from PIL import Image, ImageOps
+    resample = Image.BILINEAR if fast else Image.LANCZOS
+    return ImageOps.fit(img, size, resample)
+
+@traced("image.load_thumbnail", cat="image")
+def load_thumbnail(url, size=IMAGE_SIZE, fast=FAST_RESAMPLE):
+    """Уменьшенная картинка: с диска, иначе скачиваем, ресайзим и сохраняем на диск."""
+    if not url:
+        return None
+    disk = get_disk_cache()
+    img = disk.load(url, size, fast)
+    if img is not None:
+        return img
+    try:
+        img = fit(decode(fetch(url), size, fast), size, fast)
+    except Exception:
+        return placeholder(size)
+    disk.store(url, size, img, fast)
+    return img
@@ -0,0 +1,138 @@
+# live_search.py
+from collections import OrderedDict
+
+from api import search_meals
+from catalog import get_catalog
+
+DEBOUNCE_MS = 250     # пауза после последней клавиши перед запросом
+STREAM_CHUNK = 40     # столько строк за один проход Tk-цикла
+PREFIX_CACHE_SIZE = 64
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+class LiveSearch:
+    """Поиск по мере ввода.
+
+    text_changed(text) вызывается на каждое изменение поля: таймер debounce перезапускается,
+    а всё, что ещё в полёте для старого текста, отменяется через канал планировщика — задача,
+    не успевшая стартовать, не выполняется, а поздний ответ не попадает в UI. Поэтому
+    в очереди никогда не копятся запросы для устаревшего текста.
+
+    Откуда берутся результаты, по порядку:
+      1. каталог (python catalog.py sync), если он не пуст — без сети;
+      2. кэш уже полученных ответов: search.php ищет подстроку, значит ответ для "chick"
+         содержит все блюда для "chicken" — достаточно отфильтровать его локально;
+      3. search_meals() — все совпадения, а не только первое.
+    Результаты отдаются порциями по STREAM_CHUNK: on_results(query, meals, replace) —
+    первая порция с replace=True, следующие дописываются в конец.
+
+    after(ms, fn) / after_cancel(id) — таймеры Tk (root.after), scheduler — общий пул.
+    """
+
+    CHANNEL = "live-search"
+
+    def __init__(self, scheduler, after, after_cancel, on_results, delay_ms=DEBOUNCE_MS,
+                 fetch=search_meals, catalog=get_catalog):
+        self.scheduler = scheduler
+        self.after = after
+        self.after_cancel = after_cancel
+        self.on_results = on_results
+        self.delay_ms = delay_ms
+        self.fetch = fetch
+        self.catalog = catalog
+        self.query = None       # последний запущенный запрос
+        self._timer = None
+        self._stream = 0        # номер текущей порционной выдачи; новая выдача обрывает старую
+        self._prefix = OrderedDict()
+
+    # ---------------- input ----------------
+    def text_changed(self, text):
+        self._cancel_timer()
+        q = normalize(text)
+        if q == self.query:
+            return  # изменились только регистр/пробелы — текущий запрос продолжает жить
+        # старый запрос больше не нужен: ни его ответ, ни недоотданные порции
+        self.cancel()
+        self.query = None
+        if not q:
+            self.query = ""
+            self.on_results("", [], True)
+            return
+        self._timer = self.after(self.delay_ms, lambda: self.run(q))
+
+    def run(self, text):
+        """Запустить поиск сразу, без debounce (Enter / кнопка "Найти")."""
+        self._cancel_timer()
+        q = normalize(text)
+        self.query = q
+        self._stream += 1
+        self.scheduler.cancel(self.CHANNEL)
+        if not q:
+            self.on_results("", [], True)
+            return
+        local = self._from_prefix_cache(q)
+        if local is not None:
+            self._emit(q, local)
+            return
+        self.scheduler.submit(lambda: self._lookup(q), on_done=lambda res: self._finished(q, *res),
+                              key=("live-search", q), channel=self.CHANNEL)
+
+    def cancel(self):
+        self._cancel_timer()
+        self.scheduler.cancel(self.CHANNEL)
+        self._stream += 1
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self.after_cancel(self._timer)
+            self._timer = None
+
+    # ---------------- sources ----------------
+    def _lookup(self, q):
+        # выполняется в пуле; второй элемент — ответ сети (его можно фильтровать по подстроке)
+        catalog = self.catalog()
+        if len(catalog):
+            return catalog.query(q), False
+        return self.fetch(q), True
+
+    def _finished(self, q, meals, from_network):
+        # пустой ответ не запоминаем: это может быть и сетевая ошибка
+        if from_network and meals:
+            self._remember(q, meals)
+        self._emit(q, meals)
+
+    def _remember(self, q, meals):
+        # кэш префиксов трогается только из Tk-потока
+        self._prefix[q] = meals
+        self._prefix.move_to_end(q)
+        while len(self._prefix) > PREFIX_CACHE_SIZE:
+            self._prefix.popitem(last=False)
+
+    def _from_prefix_cache(self, q):
+        best = None
+        for known, meals in self._prefix.items():
+            if known in q and (best is None or len(known) > len(best[0])):
+                best = (known, meals)
+        if best is None:
+            return None
+        if best[0] == q:
+            return best[1]
+        return [m for m in best[1] if q in normalize(m.get("strMeal"))]
+
+    # ---------------- streaming ----------------
+    def _emit(self, q, meals):
+        if q != self.query:
+            return
+        stream = self._stream
+        meals = list(meals or [])
+
+        def push(start):
+            if stream != self._stream:
+                return  # пока отдавали порции, текст успел измениться
+            self.on_results(q, meals[start:start + STREAM_CHUNK], start == 0)
+            if start + STREAM_CHUNK < len(meals):
+                self.after(0, lambda: push(start + STREAM_CHUNK))
+        push(0)
@@ -0,0 +1,56 @@
+# metrics.py
+import threading
+import time
+from collections import defaultdict
+
+# ---------------- latency counters ----------------
+# Простые потокобезопасные счётчики: число вызовов, ошибок и суммарное время
+# по имени (например, эндпоинту API).
+
+class LatencyStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = defaultdict(lambda: {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            d = self._data[name]
+            d["count"] += 1
+            d["total"] += seconds
+            if seconds > d["max"]:
+                d["max"] = seconds
+            if not ok:
+                d["errors"] += 1
+
+    def timer(self, name):
+        return _Timer(self, name)
+
+    def snapshot(self):
+        with self._lock:
+            out = {}
+            for name, d in self._data.items():
+                avg = d["total"] / d["count"] if d["count"] else 0.0
+                out[name] = dict(d, avg=avg)
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Timer:
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stats.record(self.name, time.perf_counter() - self.start, ok=exc_type is None)
+        return False
+
+
+# общие счётчики приложения (старт, UI и т.п.)
+app_stats = LatencyStats()
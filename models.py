@@ -0,0 +1,85 @@
+# models.py
+from dataclasses import dataclass, field
+
+MAX_INGREDIENTS = 20
+
+
+def parse_ingredients(meal):
+    # strIngredient1..20 / strMeasure1..20 -> [(ингредиент, мера), ...] без пустых слотов
+    out = []
+    for i in range(1, MAX_INGREDIENTS + 1):
+        ing = meal.get(f"strIngredient{i}")
+        if ing and ing.strip():
+            out.append((ing.strip(), (meal.get(f"strMeasure{i}") or "").strip()))
+    return out
+
+
+@dataclass(slots=True)
+class Recipe:
+    id: str
+    name: str = ""
+    category: str = ""
+    area: str = ""
+    instructions: str = ""
+    thumb: str = ""
+    tags: str = ""
+    youtube: str = ""
+    source: str = ""
+    ingredients: list = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, meal):
+        return cls(
+            id=meal.get("idMeal") or "",
+            name=meal.get("strMeal") or "",
+            category=meal.get("strCategory") or "",
+            area=meal.get("strArea") or "",
+            instructions=meal.get("strInstructions") or "",
+            thumb=meal.get("strMealThumb") or "",
+            tags=meal.get("strTags") or "",
+            youtube=meal.get("strYoutube") or "",
+            source=meal.get("strSource") or "",
+            ingredients=parse_ingredients(meal),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        # принимает и компактную запись, и "сырой" словарь TheMealDB (старый favorites.json)
+        if isinstance(data, cls):
+            return data
+        if "idMeal" in data:
+            return cls.from_api(data)
+        return cls(
+            id=data.get("id") or "",
+            name=data.get("name") or "",
+            category=data.get("category") or "",
+            area=data.get("area") or "",
+            instructions=data.get("instructions") or "",
+            thumb=data.get("thumb") or "",
+            tags=data.get("tags") or "",
+            youtube=data.get("youtube") or "",
+            source=data.get("source") or "",
+            ingredients=[tuple(p) for p in data.get("ingredients") or []],
+        )
+
+    def to_dict(self):
+        # компактная сериализация: пустые поля не пишем, ингредиенты — пары [ing, measure]
+        out = {"id": self.id, "name": self.name}
+        for key in ("category", "area", "instructions", "thumb", "tags", "youtube", "source"):
+            value = getattr(self, key)
+            if value:
+                out[key] = value
+        if self.ingredients:
+            out["ingredients"] = [list(p) for p in self.ingredients]
+        return out
+
+    @property
+    def is_full(self):
+        # краткие записи из filter.php не содержат инструкции и ингредиенты
+        return bool(self.instructions or self.ingredients)
+
+    def meta_text(self):
+        return f"{self.category or '—'}  •  {self.area or '—'}"
+
+    def ingredient_lines(self):
+        return [f"• {ing} — {meas}" if meas else f"• {ing}" for ing, meas in self.ingredients]
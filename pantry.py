@@ -0,0 +1,179 @@
+# pantry.py
+import re
+import sys
+import threading
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy — битовые маски на int (медленнее, но тоже одним проходом)
+    np = None
+
+from cache import get_cache
+from catalog import get_catalog
+from models import Recipe
+
+# ---------------- ingredient normalization ----------------
+# "Chopped Fresh Tomatoes" -> "tomato", "Spring Onions" -> "scallion"
+DESCRIPTORS = {
+    "fresh", "chopped", "diced", "sliced", "minced", "grated", "ground", "dried", "large", "small",
+    "medium", "whole", "boneless", "skinless", "free", "range", "organic", "finely", "roughly",
+    "frozen", "raw", "cooked", "plain", "unsalted", "salted", "extra", "virgin", "of", "to", "taste",
+}
+ALIASES = {
+    "spring onion": "scallion", "green onion": "scallion", "scallions": "scallion",
+    "coriander": "cilantro", "coriander leaf": "cilantro", "courgette": "zucchini",
+    "aubergine": "eggplant", "plain flour": "flour", "all purpose flour": "flour",
+    "caster sugar": "sugar", "granulated sugar": "sugar", "double cream": "heavy cream",
+    "minced beef": "beef", "ground beef": "beef", "beef mince": "beef",
+    "garlic clove": "garlic", "clove garlic": "garlic", "chilli": "chili", "chile": "chili",
+}
+_WORD_RE = re.compile(r"[a-zа-яё]+")
+
+
+def _singular(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("oes", "ches", "shes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us")):
+        return word[:-1]
+    return word
+
+@lru_cache(maxsize=4096)
+def normalize_ingredient(name):
+    words = [_singular(w) for w in _WORD_RE.findall((name or "").lower()) if w not in DESCRIPTORS]
+    text = " ".join(words)
+    return ALIASES.get(text, text)
+
+
+# ---------------- index ----------------
+class PantryIndex:
+    """Матрица рецепт × ингредиент (0/1) по нормализованным названиям.
+
+    match() — одно матричное умножение: сколько ингредиентов рецепта уже есть в кладовой,
+    затем покрытие (есть / нужно) и число недостающих; сортировка — lexsort.
+    Продукт кладовой засчитывается всем ингредиентам, в названии которых есть все его
+    слова: "chicken" покрывает "chicken breast" и "chicken thigh".
+    """
+
+    def __init__(self, recipes):
+        self.recipes = [r for r in recipes if r.id and r.ingredients]
+        self.vocab = {}                 # нормализованное название -> столбец
+        rows = []
+        for r in self.recipes:
+            cols = set()
+            for ing, _ in r.ingredients:
+                norm = normalize_ingredient(ing)
+                if norm:
+                    cols.add(self.vocab.setdefault(norm, len(self.vocab)))
+            rows.append(sorted(cols))
+        self.names = sorted(self.vocab, key=self.vocab.get)
+        self._word_cols = {}            # слово -> столбцы, в названии которых оно есть
+        for c, name in enumerate(self.names):
+            for word in name.split():
+                self._word_cols.setdefault(word, set()).add(c)
+        if np is not None:
+            self.matrix = np.zeros((len(rows), len(self.vocab)), dtype=np.float32)
+            for i, cols in enumerate(rows):
+                self.matrix[i, cols] = 1.0
+            self.need = self.matrix.sum(axis=1)
+        else:
+            self.masks = [sum(1 << c for c in cols) for cols in rows]
+            self.need = [len(cols) for cols in rows]
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def columns_for(self, items):
+        """Столбцы, которые покрывают продукты кладовой."""
+        cols = set()
+        for item in items:
+            words = normalize_ingredient(item).split()
+            if words:
+                cols |= set.intersection(*(self._word_cols.get(w, set()) for w in words))
+        return cols
+
+    def match(self, items, limit=50, max_missing=None):
+        """[(Recipe, есть, нужно, [недостающие ингредиенты])], лучшие сначала."""
+        if not self.recipes:
+            return []
+        cols = self.columns_for(items)
+        if np is not None:
+            pantry = np.zeros(len(self.vocab), dtype=np.float32)
+            pantry[list(cols)] = 1.0
+            have = self.matrix @ pantry
+            missing = self.need - have
+            keep = have > 0
+            if max_missing is not None:
+                keep &= missing <= max_missing
+            idx = np.flatnonzero(keep)
+            # сначала покрытие (убывание), затем меньше недостающих, затем больше совпадений
+            order = idx[np.lexsort((-have[idx], missing[idx], -(have[idx] / self.need[idx])))][:limit]
+            have_list = have[order].astype(int).tolist()
+            order = order.tolist()
+        else:
+            mask = sum(1 << c for c in cols)
+            scored = []
+            for i, row in enumerate(self.masks):
+                h = (row & mask).bit_count()
+                m = self.need[i] - h
+                if h and (max_missing is None or m <= max_missing):
+                    scored.append((-h / self.need[i], m, -h, i))
+            scored.sort()
+            order = [s[3] for s in scored[:limit]]
+            have_list = [-s[2] for s in scored[:limit]]
+        out = []
+        for i, h in zip(order, have_list):
+            recipe = self.recipes[i]
+            missing = {}
+            for ing, _ in recipe.ingredients:
+                col = self.vocab.get(normalize_ingredient(ing))
+                if col not in cols:
+                    missing.setdefault(col, ing)
+            out.append((recipe, h, h + len(missing), list(missing.values())))
+        return out
+
+
+def collect_recipes():
+    """Все полные рецепты, что есть локально: каталог, кэш ответов API, избранное."""
+    from utils import load_favorites
+    by_id = {}
+    for meal in get_catalog().meals.values():
+        by_id[meal["idMeal"]] = meal
+    cache = get_cache()
+    for endpoint in ("lookup.php", "search.php"):
+        for data in cache.values(endpoint):
+            for meal in (data or {}).get("meals") or []:
+                if meal and meal.get("idMeal"):
+                    by_id.setdefault(meal["idMeal"], meal)
+    recipes = [Recipe.from_dict(m) for m in by_id.values()]
+    seen = set(by_id)
+    recipes += [r for r in load_favorites() if r.id not in seen and r.is_full]
+    return recipes
+
+
+# ---------------- shared instance ----------------
+_index = None
+_index_lock = threading.Lock()
+
+def get_pantry_index(rebuild=False):
+    global _index
+    with _index_lock:
+        if _index is None or rebuild:
+            _index = PantryIndex(collect_recipes())
+        return _index
+
+
+def main(argv):
+    # python pantry.py chicken, garlic, rice
+    items = [p.strip() for p in " ".join(argv).split(",") if p.strip()]
+    index = get_pantry_index()
+    for recipe, have, need, missing in index.match(items, limit=20):
+        tail = f"  нет: {', '.join(missing)}" if missing else ""
+        print(f"{have}/{need}  {recipe.name}{tail}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,101 @@
+# pantry_view.py
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from pantry import get_pantry_index
+from ui_common import BG, PANEL, CARD, PRIMARY, TEXT, MUTED
+
+MAX_RESULTS = 100
+
+
+class PantryView:
+    """Вкладка "Что приготовить": продукты через запятую -> рецепты по покрытию.
+
+    Индекс строится в пуле из того, что уже есть локально (каталог, кэш ответов,
+    избранное); сам подбор — одна матричная операция, без запросов filter.php?i=.
+    """
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.results = []
+
+        top = tk.Frame(parent, bg=PANEL, padx=12, pady=12)
+        top.pack(fill="x")
+        tk.Label(top, text="Что приготовить", bg=PANEL, fg=TEXT, font=("Segoe UI", 20, "bold")).pack(anchor="w")
+        tk.Label(top, text="Что есть дома — через запятую (chicken, rice, garlic)", bg=PANEL, fg=MUTED).pack(anchor="w", pady=(0,8))
+
+        row = tk.Frame(top, bg=PANEL)
+        row.pack(fill="x")
+        self.pantry_var = tk.StringVar()
+        entry = ttk.Entry(row, textvariable=self.pantry_var)
+        entry.pack(side="left", fill="x", expand=True)
+        entry.bind("<Return>", lambda e: self.on_match())
+        ttk.Button(row, text="Подобрать", command=self.on_match).pack(side="left", padx=(6,0))
+        ttk.Button(row, text="Обновить базу", command=self.on_rebuild).pack(side="left", padx=(6,0))
+
+        self.missing_var = tk.IntVar(value=3)
+        opts = tk.Frame(top, bg=PANEL)
+        opts.pack(fill="x", pady=(8,0))
+        tk.Label(opts, text="Не больше недостающих:", bg=PANEL, fg=TEXT).pack(side="left")
+        ttk.Spinbox(opts, from_=0, to=20, width=4, textvariable=self.missing_var,
+                    command=self.on_match).pack(side="left", padx=(6,0))
+        self.status = tk.Label(opts, text="", bg=PANEL, fg=MUTED)
+        self.status.pack(side="right")
+
+        body = tk.Frame(parent, bg=BG)
+        body.pack(fill="both", expand=True, padx=12, pady=12)
+        self.listbox = tk.Listbox(body, bg=CARD, fg=TEXT, activestyle="none", selectbackground=PRIMARY)
+        vsb = ttk.Scrollbar(body, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=vsb.set)
+        vsb.pack(side="right", fill="y")
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<Double-Button-1>", self.on_open)
+        self.listbox.bind("<Return>", self.on_open)
+
+        # индекс начинаем строить сразу, пока пользователь вводит продукты
+        self.rebuild(silent=True)
+
+    def items(self):
+        return [p.strip() for p in self.pantry_var.get().split(",") if p.strip()]
+
+    def rebuild(self, silent=False):
+        self.status.config(text="Собираю рецепты…")
+
+        def done(index):
+            self.status.config(text=f"Рецептов в базе: {len(index)}")
+            if not silent or self.items():
+                self.on_match()
+        self.app.run_async(lambda: get_pantry_index(rebuild=not silent), on_done=done, key=("pantry-index",))
+
+    def on_rebuild(self):
+        self.rebuild()
+
+    def on_match(self):
+        items = self.items()
+        if not items:
+            return
+        try:
+            max_missing = int(self.missing_var.get())
+        except (tk.TclError, ValueError):
+            max_missing = None
+
+        def task():
+            return get_pantry_index().match(items, limit=MAX_RESULTS, max_missing=max_missing)
+        self.app.run_async(task, on_done=self.show_results, key=("pantry", tuple(items), max_missing),
+                           channel="pantry")
+
+    def show_results(self, results):
+        self.results = results or []
+        self.listbox.delete(0, tk.END)
+        for recipe, have, need, missing in self.results:
+            tail = f"   нет: {', '.join(missing)}" if missing else "   ✓ всё есть"
+            self.listbox.insert(tk.END, f"{have}/{need}  {recipe.name}{tail}")
+        if not self.results:
+            messagebox.showinfo("Что приготовить", "Ничего не нашлось — попробуйте больше продуктов "
+                                                   "или синхронизируйте каталог (python catalog.py sync)")
+
+    def on_open(self, evt=None):
+        sel = self.listbox.curselection()
+        if sel and sel[0] < len(self.results):
+            self.app.open_meal(self.results[sel[0]][0].id)
@@ -0,0 +1,286 @@
+# pins.py
+import json
+import logging
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+from filelock import FileLock
+from image_cache import IMAGE_SIZE, decode, fetch, fit, get_disk_cache, load_thumbnail
+from tracing import traced
+from utils import FAV_FILE, get_store
+
+PIN_FILE = FAV_FILE + ".pins"
+JPEG_QUALITY = 85
+# файл переписывается, когда мёртвых байт больше, чем живых, и больше этого порога
+COMPACT_MIN_DEAD = 1024 * 1024
+BACKFILL_WORKERS = 4
+
+log = logging.getLogger(__name__)
+
+
+class PinStore:
+    """Офлайн-копии миниатюр избранного: все картинки одним файлом + индекс.
+
+    favorites.json.pins — уменьшенные JPEG подряд, только дописываются в конец;
+    favorites.json.pins.idx — JSON-строки {"id", "url", "off", "len", "crc"} или
+    {"id", "drop": true}, последняя строка по id выигрывает. Когда мёртвых байт становится
+    больше, чем живых, оба файла переписываются заново (tmp + os.replace). Блоб с
+    несовпавшим crc считается отсутствующим — его перепишет следующий backfill.
+
+    Несколько процессов — как у избранного: блокировка favorites.json.pins.lock, перед
+    чтением и записью дочитывается чужой хвост индекса.
+    """
+
+    def __init__(self, path=PIN_FILE):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._lock = threading.RLock()
+        self._flock = FileLock(path + ".lock")
+        self._pins = {}             # id -> (url, off, len, crc)
+        self._index_pos = 0
+        self._index_ino = None
+        self._dead = 0              # байты блобов, на которые больше нет ссылок
+        with self._lock, self._flock:
+            self._load()
+
+    # ---------------- index ----------------
+    def _load(self):
+        self._pins.clear()
+        self._index_pos = 0
+        self._index_ino = None
+        self._read_index()
+        # мёртвые байты — всё, на что индекс не ссылается, включая блобы, чья строка индекса
+        # потерялась при сбое; их уберёт следующее сжатие
+        live = sum(entry[2] for entry in self._pins.values())
+        try:
+            self._dead = max(0, os.path.getsize(self.path) - live)
+        except OSError:
+            self._dead = 0
+
+    def _read_index(self):
+        # вызывается под обеими блокировками
+        try:
+            f = open(self.index_path, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            self._index_ino = os.fstat(f.fileno()).st_ino
+            f.seek(self._index_pos)
+            torn = False
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break  # недописанная строка после сбоя
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                self._index_pos += len(line)
+                if not isinstance(rec, dict) or not rec.get("id"):
+                    continue
+                if not rec.get("drop") and not (isinstance(rec.get("off"), int) and isinstance(rec.get("len"), int)):
+                    continue  # целая, но неполная запись — пропускаем, пин перепишет backfill
+                old = self._pins.pop(rec["id"], None)
+                if old is not None:
+                    self._dead += old[2]
+                if not rec.get("drop"):
+                    self._pins[rec["id"]] = (rec.get("url"), rec["off"], rec["len"], rec.get("crc"))
+            if torn:
+                # иначе следующая запись приклеится к битой строке и не прочитается никогда
+                f.truncate(self._index_pos)
+
+    def _catch_up(self):
+        # под обеими блокировками
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            if self._index_pos:
+                self._load()
+            return
+        if st.st_ino != self._index_ino or st.st_size < self._index_pos:
+            self._load()          # другой процесс переписал файлы
+        elif st.st_size > self._index_pos:
+            self._read_index()
+
+    def _append_index(self, recs):
+        data = "".join(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for rec in recs).encode("utf-8")
+        with open(self.index_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._read_index()
+
+    # ---------------- public ----------------
+    def __len__(self):
+        return len(self._pins)
+
+    def ids(self):
+        with self._lock:
+            return list(self._pins)
+
+    def pinned_url(self, meal_id):
+        entry = self._pins.get(meal_id)
+        return entry[0] if entry else None
+
+    def size_bytes(self):
+        with self._lock:
+            return sum(entry[2] for entry in self._pins.values())
+
+    @traced("pins.load", cat="disk")
+    def get_image(self, meal_id):
+        """PIL.Image миниатюры (IMAGE_SIZE) или None, если пина нет."""
+        with self._lock, self._flock:
+            self._catch_up()
+            entry = self._pins.get(meal_id)
+            if entry is None:
+                return None
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(entry[1])
+                    blob = f.read(entry[2])
+            except OSError:
+                return None
+        if zlib.crc32(blob) != entry[3]:
+            return None
+        from PIL import Image
+        try:
+            img = Image.open(BytesIO(blob))
+            img.load()
+        except (OSError, ValueError):
+            return None
+        return img
+
+    @traced("pins.store", cat="disk")
+    def put(self, meal_id, url, img):
+        blob = _encode(img)
+        with self._lock, self._flock:
+            self._catch_up()
+            with open(self.path, "ab") as f:
+                off = f.tell()
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            self._append_index([{"id": meal_id, "url": url, "off": off, "len": len(blob),
+                                 "crc": zlib.crc32(blob)}])
+
+    def pin(self, meal_id, url):
+        """Сохраняет миниатюру; False — уже сохранена с тем же url."""
+        if not meal_id or not url or self.pinned_url(meal_id) == url:
+            return False
+        self.put(meal_id, url, render_thumbnail(url))
+        return True
+
+    def drop(self, meal_ids):
+        """Удаляет пины; возвращает id реально удалённых."""
+        with self._lock, self._flock:
+            self._catch_up()
+            dropped = [meal_id for meal_id in dict.fromkeys(meal_ids) if meal_id in self._pins]
+            if dropped:
+                self._append_index([{"id": meal_id, "drop": True} for meal_id in dropped])
+                live = sum(entry[2] for entry in self._pins.values())
+                if self._dead > COMPACT_MIN_DEAD and self._dead > live:
+                    self._compact()
+            return dropped
+
+    def compact(self):
+        with self._lock, self._flock:
+            self._catch_up()
+            self._compact()
+
+    @traced("pins.compact", cat="disk")
+    def _compact(self):
+        # под обеими блокировками; живые блобы копируются в новый файл
+        tmp_data = f"{self.path}.{os.getpid()}.tmp"
+        tmp_index = f"{self.index_path}.{os.getpid()}.tmp"
+        recs = []
+        with open(self.path, "rb") as src, open(tmp_data, "wb") as dst:
+            for meal_id, (url, off, length, crc) in self._pins.items():
+                src.seek(off)
+                recs.append({"id": meal_id, "url": url, "off": dst.tell(), "len": length, "crc": crc})
+                dst.write(src.read(length))
+            dst.flush()
+            os.fsync(dst.fileno())
+        with open(tmp_index, "wb") as f:
+            f.write("".join(json.dumps(rec, separators=(",", ":")) + "\n" for rec in recs).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        # сбой между двумя replace: старый индекс на новых данных — crc это поймает
+        os.replace(tmp_data, self.path)
+        os.replace(tmp_index, self.index_path)
+        self._load()
+
+
+def _encode(img):
+    buf = BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buf.getvalue()
+
+def render_thumbnail(url):
+    # как image_cache.load_thumbnail, но без заглушки: нет картинки — нет пина (исключение)
+    disk = get_disk_cache()
+    img = disk.load(url, IMAGE_SIZE)
+    if img is None:
+        img = fit(decode(fetch(url), IMAGE_SIZE), IMAGE_SIZE)
+        disk.store(url, IMAGE_SIZE, img)
+    return img
+
+
+# ---------------- shared instance ----------------
+_pins = None
+_pins_lock = threading.Lock()
+
+def get_pin_store():
+    global _pins
+    if _pins is None:
+        with _pins_lock:
+            if _pins is None:
+                _pins = PinStore()
+    return _pins
+
+def load_pinned_thumbnail(meal_id, url, size=IMAGE_SIZE):
+    """Миниатюра блюда из избранного: сначала пин (без сети), иначе обычный конвейер."""
+    if meal_id and size == IMAGE_SIZE:
+        img = get_pin_store().get_image(meal_id)
+        if img is not None:
+            return img
+    return load_thumbnail(url, size)
+
+def pin_favorites(hydrate=True, workers=BACKFILL_WORKERS):
+    """Фоновый проход по избранному: краткие записи дозагружаются, недостающие миниатюры
+    сохраняются, пины удалённых блюд выбрасываются. Не бросает исключений — возвращает счётчики.
+    """
+    stats = {"pinned": 0, "failed": 0, "hydrated": 0, "dropped": 0}
+    try:
+        store = get_store()
+        pins = get_pin_store()
+        favs = store.all()
+        partial = [r.id for r in favs if not r.is_full]
+        if hydrate and partial:
+            from aio_api import get_meals_by_ids
+            try:
+                full = [m for m in get_meals_by_ids(partial) if m]
+            except Exception:
+                full = []  # сети нет — попробуем в следующий раз
+            stats["hydrated"] = len(store.update_many(full))
+        stats["dropped"] = len(pins.drop([meal_id for meal_id in pins.ids() if not store.contains(meal_id)]))
+        todo = [(r.id, r.thumb) for r in favs if r.thumb and pins.pinned_url(r.id) != r.thumb]
+    except Exception:
+        log.exception("pin backfill setup failed")
+        return stats
+    if not todo:
+        return stats
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pin") as pool:
+        futures = {pool.submit(render_thumbnail, url): (meal_id, url) for meal_id, url in todo}
+        for fut in as_completed(futures):
+            meal_id, url = futures.pop(fut)
+            try:
+                pins.put(meal_id, url, fut.result())
+                stats["pinned"] += 1
+            except Exception:
+                stats["failed"] += 1
+    return stats
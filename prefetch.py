@@ -0,0 +1,69 @@
+# prefetch.py
+from api import get_meal_by_id
+from image_cache import IMAGE_SIZE, load_thumbnail
+from scheduler import Scheduler
+
+RADIUS = 3          # сколько соседей вперёд/назад
+MAX_WORKERS = 2     # бюджет: не больше 2 фоновых загрузок одновременно
+
+
+class Prefetcher:
+    """Тихо подгружает детали и картинки соседних результатов в кэш.
+
+    Свой маленький пул (MAX_WORKERS), чтобы не занимать потоки, которые нужны UI.
+    Все задачи одного "окна" живут в одном поколении канала и отменяются разом,
+    когда меняется список или выделение.
+    on_image(url, img) — необязательно; вызывается через dispatch (в Tk-потоке),
+    например чтобы заранее создать PhotoImage.
+    """
+
+    CHANNEL = "prefetch"
+
+    def __init__(self, dispatch=None, on_image=None, radius=RADIUS, max_workers=MAX_WORKERS):
+        self.radius = radius
+        self.on_image = on_image
+        self.scheduler = Scheduler(max_workers=max_workers, dispatch=dispatch, name="prefetch")
+        self.items = []
+        self._done = set()   # id, которые уже прогреты для текущего списка
+
+    def set_items(self, items):
+        self.items = list(items or [])
+        self._done.clear()
+        self.around(-1 if self.items else 0)
+
+    def extend(self, items):
+        # новые строки в конце списка; текущее окно прогрева не трогаем
+        self.items.extend(items or [])
+
+    def cancel(self):
+        self.scheduler.cancel(self.CHANNEL)
+
+    def around(self, index):
+        self.cancel()
+        order = []
+        for step in range(1, self.radius + 1):
+            order += [index + step, index - step]
+        for idx in order:
+            if 0 <= idx < len(self.items):
+                self._submit(self.items[idx])
+
+    def _submit(self, item):
+        meal_id = item.get("idMeal")
+        if not meal_id or meal_id in self._done:
+            return
+        thumb = item.get("strMealThumb")
+
+        def task():
+            meal = get_meal_by_id(meal_id)   # ложится в постоянный кэш ответов
+            url = (meal or {}).get("strMealThumb") or thumb
+            img = load_thumbnail(url, IMAGE_SIZE) if url else None  # и в дисковый кэш картинок
+            return meal_id, url, img
+
+        self.scheduler.submit(task, on_done=self._finished, key=("prefetch", meal_id),
+                              channel=self.CHANNEL, supersede=False)
+
+    def _finished(self, result):
+        meal_id, url, img = result
+        self._done.add(meal_id)
+        if self.on_image and img is not None:
+            self.on_image(url, img)
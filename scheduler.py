@@ -0,0 +1,132 @@
+# scheduler.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import LatencyStats
+
+DEFAULT_WORKERS = 6
+
+log = logging.getLogger(__name__)
+
+
+class Task:
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.callbacks = []       # (channel, generation, on_done, on_error)
+        self.submitted = time.perf_counter()
+        self.future = None
+
+
+class Scheduler:
+    """Фиксированный пул потоков вместо "поток на каждый клик".
+
+    channel — токен поколения: новый запрос в том же канале делает предыдущие устаревшими,
+    их результат не попадает в UI (а если задача ещё не стартовала — она не выполняется).
+    key — объединение одинаковых запросов: пока задача с таким ключом в полёте,
+    новые вызовы просто добавляют свой callback.
+    supersede=False — задача присоединяется к текущему поколению канала, не отменяя
+    соседей (для пачек задач, которые отменяются вместе через cancel(channel)).
+    on_error(exc) — вызывается в UI-потоке вместо on_done, если fn() упала (исключение ещё
+    и пишется в лог), чтобы вызывающий мог снять свои флаги "в работе".
+    dispatch — как доставить callback в UI-поток (например, lambda cb: root.after(0, cb)).
+    on_metrics — хук, получает dict с queue_depth / wait / latency по каждой задаче.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, dispatch=None, on_metrics=None, name="worker"):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._dispatch = dispatch or (lambda cb: cb())
+        self.on_metrics = on_metrics
+        self.stats = LatencyStats()
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._inflight = {}
+        self._queued = 0
+
+    # ---------------- generations ----------------
+    def generation(self, channel):
+        with self._lock:
+            return self._generations.get(channel, 0)
+
+    def cancel(self, channel):
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+
+    def _is_current(self, channel, generation):
+        return channel is None or self._generations.get(channel, 0) == generation
+
+    # ---------------- submit ----------------
+    def submit(self, fn, on_done=None, key=None, channel=None, name=None, supersede=True, on_error=None):
+        with self._lock:
+            generation = None
+            if channel is not None:
+                generation = self._generations.get(channel, 0)
+                if supersede:
+                    generation += 1
+                    self._generations[channel] = generation
+            if key is not None and key in self._inflight:
+                task = self._inflight[key]
+                task.callbacks.append((channel, generation, on_done, on_error))
+                return task
+            task = Task(key, name or getattr(fn, "__name__", "task"))
+            task.callbacks.append((channel, generation, on_done, on_error))
+            if key is not None:
+                self._inflight[key] = task
+            self._queued += 1
+        task.future = self._pool.submit(self._run, task, fn)
+        return task
+
+    def _run(self, task, fn):
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            depth = self._queued
+            alive = any(self._is_current(ch, gen) for ch, gen, _, _ in task.callbacks)
+            if not alive and task.key is not None:
+                self._inflight.pop(task.key, None)
+        if not alive:
+            return None  # все ожидающие уже неактуальны — даже не начинаем
+        ok = True
+        result = None
+        error = None
+        try:
+            result = fn()
+        except Exception as e:
+            ok = False
+            error = e
+            log.exception("task %s failed", task.name)
+        finished = time.perf_counter()
+        with self._lock:
+            if task.key is not None and self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+            callbacks = list(task.callbacks)
+        self.stats.record(task.name, finished - started, ok=ok)
+        if self.on_metrics:
+            try:
+                self.on_metrics({"name": task.name, "queue_depth": depth,
+                                 "wait": started - task.submitted, "latency": finished - started, "ok": ok})
+            except Exception:
+                pass
+        for channel, generation, on_done, on_error in callbacks:
+            handler = on_done if ok else on_error
+            if handler is not None:
+                self._deliver(channel, generation, handler, result if ok else error)
+        return result
+
+    def _deliver(self, channel, generation, on_done, result):
+        def cb():
+            # повторная проверка уже в UI-потоке: пока callback ждал очереди, мог прийти новый запрос
+            with self._lock:
+                if not self._is_current(channel, generation):
+                    return
+            on_done(result)
+        self._dispatch(cb)
+
+    def queue_depth(self):
+        with self._lock:
+            return self._queued
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
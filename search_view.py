@@ -0,0 +1,327 @@
+# search_view.py
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from api import get_random_meal, get_meal_by_id
+from filters import get_filter_engine
+from live_search import LiveSearch
+from models import Recipe
+from startup import StartupOrchestrator
+from thumb_grid import ThumbnailGrid
+from tracing import traced
+from ui_common import (BG, PANEL, CARD, PRIMARY, TEXT, MUTED, scrollable_frame,
+                       selected_values, set_listbox_values, set_readonly_text)
+from utils import add_to_favorites, get_store, is_favorite
+
+SIMILAR_SHOWN = 6
+SIMILAR_THUMB = (96, 96)
+
+
+class SearchView:
+    """Вкладка "Поиск": фильтры и список результатов слева, карточка блюда справа."""
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.current_results = []
+        self.current_main_meal = None
+        self.current_main_img = None
+        # стартовый список не должен затирать результаты, которые пользователь уже запросил сам
+        self.user_results = False
+        self._open_first = False   # "Найти"/Enter: первое найденное блюдо сразу открывается справа
+        self._build_left()
+        self._build_detail()
+        self.startup = StartupOrchestrator(
+            submit=lambda fn, on_done=None: app.run_async(fn, on_done=on_done),
+            on_categories=lambda cats: set_listbox_values(self.cat_lb, cats or []),
+            on_areas=lambda areas: set_listbox_values(self.area_lb, areas or []),
+            on_samples=self.on_startup_samples,
+        )
+        # поиск по мере ввода: debounce, отмена устаревших запросов, выдача порциями
+        self.live = LiveSearch(app.scheduler, after=self.parent.after, after_cancel=self.parent.after_cancel,
+                               on_results=self.on_live_results)
+        self.search_var.trace_add("write", lambda *_: self.live.text_changed(self.search_var.get()))
+        self.search_entry.bind("<Return>", lambda e: self.on_search_clicked())
+
+    # ---------------- SEARCH LAYOUT ----------------
+    def _build_left(self):
+        # Left column: filters + results
+        left = tk.Frame(self.parent, bg=PANEL, width=360, padx=12, pady=12)
+        left.pack(side="left", fill="y")
+        self.left = left
+
+        tk.Label(left, text="MealFinder", bg=PANEL, fg=TEXT, font=("Segoe UI", 24, "bold")).pack(anchor="w")
+        tk.Label(left, text="Поиск и фильтрация рецептов", bg=PANEL, fg=MUTED).pack(anchor="w", pady=(0,8))
+
+        # Search entry
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(left, textvariable=self.search_var, width=30)
+        self.search_entry.pack(pady=(4,8), fill="x")
+
+        ttk.Button(left, text="🔍 Найти", command=self.on_search_clicked).pack(fill="x", pady=4)
+        ttk.Button(left, text="🎲 Случайный", command=self.on_random_clicked).pack(fill="x", pady=4)
+
+        # Filters (можно выбрать несколько категорий и/или стран)
+        tk.Label(left, text="Категория:", bg=PANEL, fg=TEXT).pack(anchor="w", pady=(12,0))
+        self.cat_lb = tk.Listbox(left, bg=CARD, fg=TEXT, height=4, selectmode="multiple", exportselection=False,
+                                 activestyle="none", selectbackground=PRIMARY)
+        self.cat_lb.pack(fill="x", pady=4)
+
+        tk.Label(left, text="Страна:", bg=PANEL, fg=TEXT).pack(anchor="w", pady=(6,0))
+        self.area_lb = tk.Listbox(left, bg=CARD, fg=TEXT, height=4, selectmode="multiple", exportselection=False,
+                                  activestyle="none", selectbackground=PRIMARY)
+        self.area_lb.pack(fill="x", pady=4)
+
+        ttk.Button(left, text="Применить фильтр", command=self.on_apply_filter).pack(fill="x", pady=8)
+
+        # Result list (текстовый список или сетка миниатюр)
+        self.grid_view_var = tk.BooleanVar(value=False)
+        results_holder = tk.Frame(left, bg=PANEL)
+
+        self.results_lb = tk.Listbox(results_holder, bg=CARD, fg=TEXT, width=40, height=18, activestyle="none",
+                                     selectbackground=PRIMARY)
+        self.results_lb.pack(fill="both", expand=True)
+        self.results_lb.bind("<<ListboxSelect>>", self.on_result_selected)
+
+        self.results_grid = ThumbnailGrid(results_holder,
+                                          load_image=lambda url, size, cb: self.app.fetch_image_tk(url, cb, size=size),
+                                          on_select=self.open_result,
+                                          bg=CARD, fg=TEXT, select_bg=PRIMARY)
+
+        ttk.Checkbutton(left, text="Сетка с миниатюрами", variable=self.grid_view_var,
+                        command=self.on_results_view_toggled).pack(anchor="w")
+        results_holder.pack(fill="both", expand=True, pady=(8,0))
+
+    # ---------------- RIGHT: main detail area (scrollable) ----------------
+    def _build_detail(self):
+        right_container = tk.Frame(self.parent, bg=BG)
+        right_container.pack(side="left", fill="both", expand=True, padx=12, pady=12)
+
+        self.canvas, detail_frame = scrollable_frame(right_container)
+        self.detail_frame = detail_frame
+
+        # Inside detail_frame: fixed layout: image block at top-left, texts below/right
+        image_block = tk.Frame(detail_frame, bg=BG)
+        image_block.pack(anchor="nw", pady=(6,12))
+
+        self.meal_img_label = tk.Label(image_block, bg=BG)
+        self.meal_img_label.pack()
+
+        self.addfav_btn = tk.Button(image_block, text="⭐ Добавить в избранное", bg=PRIMARY, fg="white",
+                                    font=("Segoe UI", 11, "bold"), relief="flat")
+        self.addfav_btn.pack(pady=(8,0))
+
+        # Title and meta
+        self.title_label = tk.Label(detail_frame, text="Выберите блюдо", bg=BG, fg=TEXT,
+                                    font=("Segoe UI", 20, "bold"), anchor="w")
+        self.title_label.pack(anchor="nw", pady=(6,4))
+        self.meta_label = tk.Label(detail_frame, text="", bg=BG, fg=MUTED, font=("Segoe UI", 10), anchor="w")
+        self.meta_label.pack(anchor="nw", pady=(0,12))
+
+        # Similar dishes: показывается, только когда в таблице соседей что-то есть
+        self.similar_label = tk.Label(detail_frame, text="Похожие блюда:", bg=BG, fg=TEXT)
+        self.similar_strip = tk.Frame(detail_frame, bg=BG)
+
+        # Ingredients (Text with own scrollbar)
+        ing_frame = tk.Frame(detail_frame, bg=BG)
+        ing_frame.pack(fill="x", padx=(0,0), pady=(0,12))
+        self.ing_frame = ing_frame
+        tk.Label(ing_frame, text="Ингредиенты:", bg=BG, fg=TEXT).pack(anchor="nw")
+        self.ing_text = tk.Text(ing_frame, height=8, wrap="word", bg=CARD, fg=TEXT, bd=0)
+        ing_scroll = ttk.Scrollbar(ing_frame, orient="vertical", command=self.ing_text.yview)
+        self.ing_text.configure(yscrollcommand=ing_scroll.set)
+        ing_scroll.pack(side="right", fill="y")
+        self.ing_text.pack(side="left", fill="both", expand=True)
+
+        # Instructions (Text with own scrollbar)
+        instr_frame = tk.Frame(detail_frame, bg=BG)
+        instr_frame.pack(fill="both", expand=True, pady=(0,20))
+        tk.Label(instr_frame, text="Инструкция:", bg=BG, fg=TEXT).pack(anchor="nw")
+        self.instr_text = tk.Text(instr_frame, height=12, wrap="word", bg=CARD, fg=TEXT, bd=0)
+        instr_scroll = ttk.Scrollbar(instr_frame, orient="vertical", command=self.instr_text.yview)
+        self.instr_text.configure(yscrollcommand=instr_scroll.set)
+        instr_scroll.pack(side="right", fill="y")
+        self.instr_text.pack(side="left", fill="both", expand=True)
+
+    # ---------------- search / random / filters ----------------
+    def on_search_clicked(self):
+        q = self.search_var.get().strip()
+        if not q:
+            messagebox.showinfo("Внимание", "Введите название блюда")
+            return
+        self._open_first = True
+        self.live.run(q)
+
+    def on_live_results(self, query, meals, replace):
+        if not query:
+            return  # поле очищено — оставляем то, что уже на экране
+        if replace:
+            self.user_results = True
+            self.populate_result_list(meals)
+        else:
+            self.append_results(meals)
+        if self._open_first and replace:
+            self._open_first = False
+            self.show_main_meal(meals[0] if meals else None)
+
+    def on_random_clicked(self):
+        self.app.run_async(get_random_meal, on_done=self.show_main_meal, channel="detail")
+
+    def on_apply_filter(self):
+        cats = selected_values(self.cat_lb)
+        areas = selected_values(self.area_lb)
+        if not cats and not areas:
+            messagebox.showinfo("Фильтр", "Выберите категорию или страну")
+            return
+        # (кат1 ∪ кат2 ...) ∩ (страна1 ∪ страна2 ...) — считается локально по кэшированным множествам ID
+        self.user_results = True
+        self.app.run_async(lambda: get_filter_engine().filter(cats, areas), on_done=self.populate_result_list,
+                           key=("filter", tuple(cats), tuple(areas)), channel="results")
+
+    def on_startup_samples(self, meals):
+        if not self.user_results:
+            self.populate_result_list(meals)
+
+    # ---------------- results ----------------
+    def append_results(self, meals):
+        self.current_results.extend(meals)
+        for m in meals:
+            self.results_lb.insert(tk.END, m.get("strMeal", "—"))
+        if self.grid_view_var.get():
+            self.results_grid.append_items(meals)
+        self.app.prefetcher.extend(meals)
+
+    def on_results_view_toggled(self):
+        if self.grid_view_var.get():
+            self.results_lb.pack_forget()
+            self.results_grid.pack(fill="both", expand=True)
+            self.results_grid.set_items(self.current_results)
+        else:
+            self.results_grid.pack_forget()
+            self.results_lb.pack(fill="both", expand=True)
+
+    def populate_result_list(self, meals):
+        self.current_results = meals or []
+        self.results_lb.delete(0, tk.END)
+        for m in self.current_results:
+            self.results_lb.insert(tk.END, m.get("strMeal", "—"))
+        if self.grid_view_var.get():
+            self.results_grid.set_items(self.current_results)
+        self.app.prefetcher.set_items(self.current_results)
+
+    def on_result_selected(self, evt):
+        sel = self.results_lb.curselection()
+        if not sel:
+            return
+        self.open_result(sel[0])
+
+    def open_result(self, idx):
+        if idx >= len(self.current_results):
+            return
+        item = self.current_results[idx]
+        self.app.prefetcher.around(idx)
+        self.open_meal(item.get("idMeal"))
+
+    def open_meal(self, meal_id):
+        # блюдо из избранного уже лежит полной записью — без запроса lookup.php
+        store = get_store(create=False)
+        stored = store.get(meal_id) if store is not None else None
+        if stored is not None and stored.is_full:
+            self.app.scheduler.cancel("detail")  # запрос, который ещё в пути, уже не нужен
+            self.show_main_meal(stored)
+            return
+        self.app.run_async(lambda: get_meal_by_id(meal_id), on_done=self.show_main_meal,
+                           key=("meal", meal_id), channel="detail")
+
+    # ---------------- detail ----------------
+    @traced("ui.show_main_meal", cat="ui")
+    def show_main_meal(self, meal):
+        if not meal:
+            messagebox.showinfo("Результат", "Блюдо не найдено")
+            return
+        meal = Recipe.from_dict(meal)
+        self.current_main_meal = meal
+        self.title_label.config(text=meal.name or "—")
+        self.meta_label.config(text=meal.meta_text())
+
+        # ingredients
+        set_readonly_text(self.ing_text, "\n".join(meal.ingredient_lines()))
+
+        # instructions
+        set_readonly_text(self.instr_text, meal.instructions)
+
+        # image load async
+        self.app.fetch_image_tk(meal.thumb, self.update_main_image, channel="main-image", meal_id=meal.id)
+
+        # fav button state and command
+        self.update_fav_button()
+
+        def do_add():
+            if add_to_favorites(meal):
+                self.addfav_btn.config(text="✓ В избранном", state="disabled")
+                self.app.favorites_changed()
+                messagebox.showinfo("Избранное", "Добавлено в избранное")
+            else:
+                messagebox.showinfo("Избранное", "Уже в избранном")
+        self.addfav_btn.config(command=do_add)
+
+        self.load_similar(meal)
+
+    def update_fav_button(self):
+        meal = self.current_main_meal
+        if meal is None:
+            return
+        if is_favorite(meal.id):
+            self.addfav_btn.config(text="✓ В избранном", state="disabled")
+        else:
+            self.addfav_btn.config(text="⭐ Добавить в избранное", state="normal")
+
+    def favorites_refreshed(self, changed):
+        # избранное поменял другой процесс
+        if self.current_main_meal is not None and self.current_main_meal.id in changed:
+            self.update_fav_button()
+
+    # ---------------- similar dishes ----------------
+    def load_similar(self, meal):
+        def task():
+            # NumPy и индекс грузятся только здесь, в пуле, а не при старте окна
+            from similar import get_similar_index
+            index = get_similar_index()
+            index.add([meal])  # только что загруженное блюдо: сравнение с остальными, не N×N
+            return index.neighbors(meal.id, limit=SIMILAR_SHOWN)
+        self.app.run_async(task, on_done=lambda items: self.show_similar(meal.id, items),
+                           key=("similar", meal.id), channel="similar")
+
+    def show_similar(self, meal_id, items):
+        if self.current_main_meal is None or self.current_main_meal.id != meal_id:
+            return
+        for w in self.similar_strip.winfo_children():
+            w.destroy()
+        if not items:
+            self.similar_label.pack_forget()
+            self.similar_strip.pack_forget()
+            return
+        self.similar_label.pack(anchor="nw", before=self.ing_frame)
+        self.similar_strip.pack(anchor="nw", fill="x", pady=(4,12), before=self.ing_frame)
+        for item in items:
+            card = tk.Frame(self.similar_strip, bg=CARD, padx=4, pady=4, cursor="hand2")
+            card.pack(side="left", padx=(0,8), anchor="n")
+            img = tk.Label(card, bg=CARD, width=SIMILAR_THUMB[0] // 8)
+            img.pack()
+            name = tk.Label(card, text=item["name"] or "—", bg=CARD, fg=TEXT, font=("Segoe UI", 9),
+                            wraplength=SIMILAR_THUMB[0], justify="center")
+            name.pack()
+            for w in (card, img, name):
+                w.bind("<Button-1>", lambda e, meal_id=item["id"]: self.open_meal(meal_id))
+
+            def set_image(tkimg, label=img):
+                if tkimg and label.winfo_exists():
+                    label.config(image=tkimg, width=0)
+                    label.image = tkimg
+            self.app.fetch_image_tk(item["thumb"], set_image, size=SIMILAR_THUMB)
+
+    def update_main_image(self, tkimg):
+        if tkimg:
+            self.current_main_img = tkimg
+            self.meal_img_label.config(image=self.current_main_img)
+            self.meal_img_label.image = self.current_main_img
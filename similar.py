@@ -0,0 +1,258 @@
+# similar.py
+import json
+import math
+import sqlite3
+import sys
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy соседи не пересчитываются, отдаются только сохранённые
+    np = None
+
+from catalog import CATALOG_FILE
+from models import Recipe
+from pantry import normalize_ingredient
+
+TOP_K = 8
+# вес признаков поверх TF-IDF: категория и страна важнее одного ингредиента
+CATEGORY_WEIGHT = 2.0
+AREA_WEIGHT = 1.5
+
+
+def recipe_tokens(recipe):
+    tokens = {normalize_ingredient(ing) for ing, _ in recipe.ingredients}
+    tokens.discard("")
+    if recipe.category:
+        tokens.add("category:" + recipe.category.lower())
+    if recipe.area:
+        tokens.add("area:" + recipe.area.lower())
+    return sorted(tokens)
+
+def _token_weight(token):
+    if token.startswith("category:"):
+        return CATEGORY_WEIGHT
+    if token.startswith("area:"):
+        return AREA_WEIGHT
+    return 1.0
+
+
+class SimilarIndex:
+    """Таблица top-k похожих блюд (косинус по TF-IDF ингредиентов + категория/страна).
+
+    Лежит рядом с каталогом (тот же SQLite-файл, таблицы similar_items / similar_neighbors).
+    build() — полный пересчёт одной матричной операцией (N×N). add() — инкрементально:
+    новые рецепты сравниваются со всеми (k×N), у старых обновляются только строки, куда
+    новичок попал в top-k. neighbors() при открытии рецепта — только чтение таблицы.
+    """
+
+    def __init__(self, path=CATALOG_FILE, k=TOP_K):
+        self.k = k
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS similar_items (id TEXT PRIMARY KEY, data TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS similar_neighbors (id TEXT PRIMARY KEY, data TEXT, updated_at REAL)")
+        self.items = {}        # id -> {"name", "thumb", "tokens"}
+        self.table = {}        # id -> [(id соседа, сходство)], по убыванию
+        for meal_id, data in self._db.execute("SELECT id, data FROM similar_items"):
+            self.items[meal_id] = json.loads(data)
+        for meal_id, data in self._db.execute("SELECT id, data FROM similar_neighbors"):
+            self.table[meal_id] = [tuple(p) for p in json.loads(data)]
+        self._ids = None       # порядок строк матрицы; None — соберётся при первом add()/build()
+        self._pos = {}
+        self._X = None
+
+    def __len__(self):
+        return len(self.items)
+
+    # ---------------- vectors ----------------
+    def _idf(self, token):
+        n = max(1, len(self.items))
+        return (math.log((1 + n) / (1 + self._df.get(token, 0))) + 1) * _token_weight(token)
+
+    def _reset_matrix(self):
+        # полная сборка: словарь и idf по всем items (O(N·V), без N²)
+        self._df = {}
+        for item in self.items.values():
+            for tok in item["tokens"]:
+                self._df[tok] = self._df.get(tok, 0) + 1
+        self._vocab = {tok: i for i, tok in enumerate(self._df)}
+        self._weights = np.array([self._idf(t) for t in self._vocab], dtype=np.float32)
+        self._ids = list(self.items)
+        self._pos = {meal_id: i for i, meal_id in enumerate(self._ids)}
+        self._X = self._vectors([self.items[i]["tokens"] for i in self._ids])
+
+    def _vectors(self, token_lists):
+        X = np.zeros((len(token_lists), len(self._vocab)), dtype=np.float32)
+        for row, tokens in enumerate(token_lists):
+            cols = [self._vocab[t] for t in tokens if t in self._vocab]
+            X[row, cols] = self._weights[cols]
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return X / norms
+
+    def _extend_matrix(self, fresh):
+        # новые рецепты дописываются строками; idf старых токенов заморожен до следующего build()
+        new_tokens = []
+        for meal_id in fresh:
+            for tok in self.items[meal_id]["tokens"]:
+                self._df[tok] = self._df.get(tok, 0) + 1
+                if tok not in self._vocab:
+                    self._vocab[tok] = len(self._vocab)
+                    new_tokens.append(tok)
+        if new_tokens:
+            self._weights = np.concatenate([self._weights, np.array([self._idf(t) for t in new_tokens],
+                                                                    dtype=np.float32)])
+            self._X = np.hstack([self._X, np.zeros((len(self._ids), len(new_tokens)), dtype=np.float32)])
+        vectors = self._vectors([self.items[i]["tokens"] for i in fresh])
+        appended = []
+        for meal_id, vec in zip(fresh, vectors):
+            if meal_id in self._pos:
+                self._X[self._pos[meal_id]] = vec
+            else:
+                self._pos[meal_id] = len(self._ids)
+                self._ids.append(meal_id)
+                appended.append(vec)
+        if appended:
+            self._X = np.vstack([self._X, np.array(appended, dtype=np.float32)])
+
+    def _topk(self, sims, exclude):
+        # sims — строка сходств с self._ids; exclude — индекс самого рецепта
+        sims = sims.copy()
+        sims[exclude] = -1.0
+        k = min(self.k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(self._ids[j], round(float(sims[j]), 4)) for j in top if sims[j] > 0]
+
+    # ---------------- build / update ----------------
+    def _remember(self, recipes):
+        fresh = []
+        for r in recipes:
+            r = Recipe.from_dict(r)
+            if not r.id or not r.ingredients:
+                continue
+            tokens = recipe_tokens(r)
+            old = self.items.get(r.id)
+            if old is None or old["tokens"] != tokens:
+                self.items[r.id] = {"name": r.name, "thumb": r.thumb, "tokens": tokens}
+                fresh.append(r.id)
+        return fresh
+
+    def build(self, recipes=()):
+        """Полный пересчёт: все рецепты (старые + recipes) попарно, одним умножением матриц."""
+        with self._lock:
+            self._remember(recipes)
+            if np is None or not self.items:
+                return 0
+            self._reset_matrix()
+            S = self._X @ self._X.T
+            self.table = {meal_id: self._topk(S[i], i) for i, meal_id in enumerate(self._ids)}
+            self._save_items(self._ids)
+            self._save_neighbors(self._ids)
+            return len(self._ids)
+
+    def add(self, recipes):
+        """Добавляет новые/изменённые рецепты; возвращает id, у которых поменялись соседи.
+
+        Стоимость — (новые × N), а не N²: полная матрица не пересчитывается.
+        """
+        with self._lock:
+            fresh = self._remember(recipes)
+            if not fresh:
+                return []
+            self._save_items(fresh)
+            if np is None:
+                return []
+            if self._ids is None:
+                self._reset_matrix()
+            else:
+                self._extend_matrix(fresh)
+            rows = [self._pos[meal_id] for meal_id in fresh]
+            S = self._X[rows] @ self._X.T
+            fresh_set = set(fresh)
+            changed = set(fresh)
+            for i, (row, meal_id) in enumerate(zip(rows, fresh)):
+                self.table[meal_id] = self._topk(S[i], row)
+            # у остальных новичок попадает в top-k, только если он лучше их k-го соседа
+            kth = np.zeros(len(self._ids), dtype=np.float32)
+            for j, meal_id in enumerate(self._ids):
+                current = self.table.get(meal_id, ())
+                if len(current) >= self.k:
+                    kth[j] = current[self.k - 1][1]
+            for j in np.flatnonzero(S.max(axis=0) > kth).tolist():
+                meal_id = self._ids[j]
+                if meal_id in changed:
+                    continue
+                merged = {other: score for other, score in self.table.get(meal_id, ()) if other not in fresh_set}
+                for i, new_id in enumerate(fresh):
+                    if S[i, j] > 0:
+                        merged[new_id] = round(float(S[i, j]), 4)
+                self.table[meal_id] = sorted(merged.items(), key=lambda p: -p[1])[:self.k]
+                changed.add(meal_id)
+            self._save_neighbors(changed)
+            return sorted(changed)
+
+    def _save_items(self, ids):
+        self._db.execute("BEGIN")
+        self._db.executemany("INSERT OR REPLACE INTO similar_items(id, data) VALUES (?, ?)",
+                             [(i, json.dumps(self.items[i], ensure_ascii=False)) for i in ids])
+        self._db.execute("COMMIT")
+
+    def _save_neighbors(self, ids):
+        now = time.time()
+        self._db.execute("BEGIN")
+        self._db.executemany("INSERT OR REPLACE INTO similar_neighbors(id, data, updated_at) VALUES (?, ?, ?)",
+                             [(i, json.dumps(self.table.get(i, [])), now) for i in ids])
+        self._db.execute("COMMIT")
+
+    # ---------------- lookup ----------------
+    def neighbors(self, meal_id, limit=None):
+        """[{"id", "name", "thumb", "score"}] — только чтение готовой таблицы."""
+        with self._lock:
+            out = []
+            for other, score in self.table.get(meal_id, [])[:limit or self.k]:
+                item = self.items.get(other)
+                if item:
+                    out.append({"id": other, "name": item["name"], "thumb": item["thumb"], "score": score})
+            return out
+
+
+# ---------------- shared instance ----------------
+_index = None
+_index_lock = threading.Lock()
+
+def get_similar_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SimilarIndex()
+                if not len(_index):
+                    # первый запуск: всё, что уже есть локально (каталог, кэш, избранное)
+                    from pantry import collect_recipes
+                    _index.build(collect_recipes())
+    return _index
+
+
+def main(argv):
+    # python similar.py build | python similar.py <id>
+    if not argv:
+        print("usage: python similar.py build | <meal id>")
+        return 2
+    index = get_similar_index()
+    if argv[0] == "build":
+        from pantry import collect_recipes
+        start = time.perf_counter()
+        count = index.build(collect_recipes())
+        print(f"{count} recipes in {time.perf_counter() - start:.2f}s")
+        return 0
+    for n in index.neighbors(argv[0]):
+        print(f"{n['score']:.3f}\t{n['id']}\t{n['name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
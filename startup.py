@@ -0,0 +1,77 @@
+# startup.py
+import threading
+import time
+
+from api import filter_meals, get_areas, get_categories
+from filters import get_filter_engine
+from metrics import app_stats
+
+# список для первого экрана запрашивается параллельно с категориями,
+# поэтому берём первую категорию из кэша, а если его нет — эту
+DEFAULT_SAMPLE_CATEGORY = "Beef"
+
+
+class StartupOrchestrator:
+    """Запуск: каждый bootstrap-запрос ровно один раз, три запроса параллельно.
+
+    1) синхронно рисуем то, что уже есть в постоянном кэше (без сети);
+    2) параллельно запрашиваем категории, страны и стартовый список;
+    3) прогреваем множества ID для фильтров.
+    Метрики: startup.first_paint (первые данные на экране) и startup.interactive
+    (все три части готовы) — в metrics.app_stats и в self.timings.
+    submit(fn, on_done) — запуск в фоне с callback в UI-потоке (Scheduler.submit).
+    """
+
+    def __init__(self, submit, on_categories, on_areas, on_samples, stats=app_stats):
+        self.submit = submit
+        self.handlers = {"categories": on_categories, "areas": on_areas, "samples": on_samples}
+        self.stats = stats
+        self.timings = {}
+        self._started = None
+        self._done = set()
+        self._painted = {}      # part -> последнее отрисованное значение
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started is not None:
+                return  # повторный вызов ничего не делает
+            self._started = time.perf_counter()
+
+        # 1) мгновенная отрисовка из кэша
+        cats = get_categories(cached_only=True)
+        areas = get_areas(cached_only=True)
+        sample_cat = cats[0] if cats else DEFAULT_SAMPLE_CATEGORY
+        for part, value in (("categories", cats), ("areas", areas),
+                            ("samples", filter_meals(category=sample_cat, cached_only=True))):
+            if value:
+                self._paint(part, value, final=False)
+
+        # 2) сеть (или revalidate кэша) — три запроса параллельно
+        results = {}
+        for part, fn in (("categories", get_categories), ("areas", get_areas),
+                         ("samples", lambda: filter_meals(category=sample_cat))):
+            self.submit(fn, on_done=lambda value, p=part: self._arrived(p, value, results))
+
+    def _arrived(self, part, value, results):
+        results[part] = value
+        self._paint(part, value, final=True)
+        if len(results) == len(self.handlers):
+            # 3) прогрев фильтров в фоне
+            cats, areas = results["categories"] or [], results["areas"] or []
+            self.submit(lambda: get_filter_engine().warm(cats, areas))
+
+    def _paint(self, part, value, final):
+        # пустой ответ (нет сети) не затирает данные из кэша; одинаковые данные не перерисовываем
+        if (value or part not in self._painted) and self._painted.get(part) != value:
+            self.handlers[part](value)
+            self._painted[part] = value
+        elapsed = time.perf_counter() - self._started
+        if value and "first_paint" not in self.timings:
+            self.timings["first_paint"] = elapsed
+            self.stats.record("startup.first_paint", elapsed)
+        if final:
+            self._done.add(part)
+            if len(self._done) == len(self.handlers) and "interactive" not in self.timings:
+                self.timings["interactive"] = elapsed
+                self.stats.record("startup.interactive", elapsed)
@@ -0,0 +1,54 @@
+# tests/test_favorites_journal.py
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import FavoritesStore  # noqa: E402
+
+
+def meal(meal_id):
+    return {"id": meal_id, "name": f"Meal {meal_id}", "instructions": "cook"}
+
+
+def test_append_after_torn_journal_line_survives_restart(tmp_path):
+    path = str(tmp_path / "favorites.json")
+    store = FavoritesStore(path)
+    store.add(meal("1"))
+    # сбой посреди записи: в журнале остаётся недописанная строка
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op":"add","meal":{"id":"2"')
+
+    store = FavoritesStore(path)
+    assert [r.id for r in store.all()] == ["1"]
+    store.add(meal("3"))
+
+    assert [r.id for r in FavoritesStore(path).all()] == ["1", "3"]
+
+
+def test_torn_line_from_other_process_is_cut_on_catch_up(tmp_path):
+    path = str(tmp_path / "favorites.json")
+    store = FavoritesStore(path)
+    store.add(meal("1"))
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op":"add"')
+    store.refresh()
+    store.add(meal("3"))
+
+    assert [r.id for r in FavoritesStore(path).all()] == ["1", "3"]
+
+
+def test_legacy_raw_snapshot_is_rewritten_compact_on_load(tmp_path):
+    path = str(tmp_path / "favorites.json")
+    raw = {"idMeal": "52772", "strMeal": "Teriyaki Chicken", "strInstructions": "cook",
+           "strIngredient1": "soy sauce", "strMeasure1": "3/4 cup", "strIngredient2": ""}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([raw], f)
+
+    store = FavoritesStore(path)
+    assert [r.id for r in store.all()] == ["52772"]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert "idMeal" not in data[0] and data[0]["id"] == "52772"
+    assert FavoritesStore(path).get("52772").name == "Teriyaki Chicken"
@@ -0,0 +1,54 @@
+# tests/test_pins.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from pins import PinStore  # noqa: E402
+
+
+def thumb(color):
+    return Image.new("RGB", (32, 32), color)
+
+
+def test_put_after_torn_index_line_is_readable(tmp_path):
+    path = str(tmp_path / "favorites.json.pins")
+    pins = PinStore(path)
+    pins.put("1", "http://x/1.jpg", thumb("red"))
+    # сбой посреди записи индекса
+    with open(pins.index_path, "ab") as f:
+        f.write(b'{"id":"2","url":"http://x/2.jpg","off"')
+
+    pins = PinStore(path)
+    assert pins.ids() == ["1"]
+    pins.put("3", "http://x/3.jpg", thumb("blue"))
+    assert pins.pinned_url("3") == "http://x/3.jpg"
+
+    reopened = PinStore(path)
+    assert sorted(reopened.ids()) == ["1", "3"]
+    assert reopened.get_image("3").size == (32, 32)
+
+
+def test_orphan_blob_counts_as_dead(tmp_path):
+    path = str(tmp_path / "favorites.json.pins")
+    pins = PinStore(path)
+    pins.put("1", "http://x/1.jpg", thumb("red"))
+    # блоб записан, а строка индекса — нет
+    with open(path, "ab") as f:
+        f.write(b"\xff" * 100)
+    assert PinStore(path)._dead == 100
+
+
+def test_malformed_index_record_is_skipped(tmp_path):
+    path = str(tmp_path / "favorites.json.pins")
+    pins = PinStore(path)
+    pins.put("1", "http://x/1.jpg", thumb("red"))
+    with open(pins.index_path, "ab") as f:
+        f.write(b'{"id":"5","url":"u"}\n')
+
+    pins = PinStore(path)
+    assert pins.ids() == ["1"]
+    pins.put("6", "http://x/6.jpg", thumb("blue"))
+    assert sorted(PinStore(path).ids()) == ["1", "6"]
@@ -0,0 +1,31 @@
+# tests/test_scheduler.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import Scheduler  # noqa: E402
+
+
+def boom():
+    raise RuntimeError("boom")
+
+
+def test_failed_task_calls_on_error_instead_of_on_done():
+    sched = Scheduler(max_workers=2)
+    done, errors = [], []
+    sched.submit(boom, on_done=done.append, on_error=errors.append).future.result()
+    sched.shutdown(wait=True)
+    assert done == []
+    assert len(errors) == 1 and isinstance(errors[0], RuntimeError)
+
+
+def test_merged_callers_all_get_the_error():
+    sched = Scheduler(max_workers=1)
+    errors = []
+    sched.submit(lambda: __import__("time").sleep(0.05))  # занимает единственный поток
+    first = sched.submit(boom, key="k", on_error=errors.append)
+    sched.submit(boom, key="k", on_error=errors.append)
+    first.future.result()
+    sched.shutdown(wait=True)
+    assert len(errors) == 2
@@ -0,0 +1,209 @@
+# thumb_grid.py
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+
+THUMB_SIZE = (120, 120)
+CELL_W = 150
+CELL_H = 165
+PREFETCH_ROWS = 2      # сколько строк ниже/выше окна грузить заранее
+MAX_INFLIGHT = 4       # сколько картинок качается одновременно
+
+
+class ThumbnailGrid(tk.Frame):
+    """Виртуализированная сетка карточек с миниатюрами.
+
+    Виджеты создаются только для видимых строк и переиспользуются при прокрутке;
+    миниатюры (видимые + PREFETCH_ROWS) грузятся через ограниченную очередь.
+    load_image(url, size, on_ready) должна вызвать on_ready(photo) в Tk-потоке.
+    """
+
+    def __init__(self, master, load_image, on_select=None, bg="#34283F", fg="#FFFFFF",
+                 select_bg="#A876F5", **kw):
+        super().__init__(master, bg=bg, **kw)
+        self.load_image = load_image
+        self.on_select = on_select
+        self.colors = (bg, fg, select_bg)
+        self.items = []
+        self.selected = None
+        self._cols = 1
+        self._cards = {}          # index -> card (только видимые)
+        self._free = []           # переиспользуемые карточки
+        self._photos = {}         # url -> PhotoImage, уже загруженные для текущего списка
+        self._queue = deque()
+        self._queued = set()
+        self._inflight = set()
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self.vsb.set)
+        self.vsb.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._relayout())
+        self._bind_wheel(self.canvas)
+
+    # ---------------- public ----------------
+    def set_items(self, items):
+        self.items = list(items or [])
+        self.selected = None
+        self._photos.clear()
+        self._queue.clear()
+        self._queued.clear()
+        for idx in list(self._cards):
+            self._release(idx)
+        self._update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self._refresh()
+
+    def append_items(self, items):
+        # дописываем в конец без сброса прокрутки и уже созданных карточек
+        self.items.extend(items or [])
+        self._update_scrollregion()
+        self._refresh()
+
+    def select(self, index):
+        old = self.selected
+        self.selected = index
+        for idx in (old, index):
+            if idx in self._cards:
+                self._paint(self._cards[idx], idx)
+
+    # ---------------- layout ----------------
+    def _relayout(self):
+        cols = max(1, self.canvas.winfo_width() // CELL_W)
+        if cols != self._cols:
+            self._cols = cols
+            for idx in list(self._cards):
+                self._release(idx)
+            self._update_scrollregion()
+        self._refresh()
+
+    def _update_scrollregion(self):
+        rows = (len(self.items) + self._cols - 1) // self._cols
+        self.canvas.configure(scrollregion=(0, 0, self._cols * CELL_W, rows * CELL_H))
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._refresh()
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -1
+        elif getattr(event, "num", None) == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step, "units")
+        self._refresh()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    def _visible_rows(self, margin=0):
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        rows = (len(self.items) + self._cols - 1) // self._cols
+        first = max(0, int(top // CELL_H) - margin)
+        last = min(rows - 1, int((top + height) // CELL_H) + margin)
+        return first, last
+
+    def _refresh(self):
+        if not self.items:
+            return
+        first, last = self._visible_rows()
+        wanted = set()
+        for row in range(first, last + 1):
+            for col in range(self._cols):
+                idx = row * self._cols + col
+                if idx < len(self.items):
+                    wanted.add(idx)
+        for idx in list(self._cards):
+            if idx not in wanted:
+                self._release(idx)
+        for idx in wanted:
+            if idx not in self._cards:
+                self._bind(idx)
+        self._schedule_images()
+
+    # ---------------- card recycling ----------------
+    def _new_card(self):
+        bg, fg, _ = self.colors
+        frame = tk.Frame(self.canvas, bg=bg, width=CELL_W - 8, height=CELL_H - 8)
+        frame.pack_propagate(False)
+        img = tk.Label(frame, bg=bg)
+        img.pack(pady=(4, 2))
+        text = tk.Label(frame, bg=bg, fg=fg, wraplength=CELL_W - 16, font=("Segoe UI", 9))
+        text.pack(fill="x")
+        window = self.canvas.create_window(0, 0, window=frame, anchor="nw")
+        card = {"frame": frame, "img": img, "text": text, "window": window, "index": None}
+        for w in (frame, img, text):
+            w.bind("<Button-1>", lambda e, c=card: self._clicked(c))
+            self._bind_wheel(w)
+        return card
+
+    def _bind(self, idx):
+        card = self._free.pop() if self._free else self._new_card()
+        card["index"] = idx
+        row, col = divmod(idx, self._cols)
+        self.canvas.coords(card["window"], col * CELL_W + 4, row * CELL_H + 4)
+        self.canvas.itemconfigure(card["window"], state="normal")
+        self._paint(card, idx)
+        self._cards[idx] = card
+
+    def _release(self, idx):
+        card = self._cards.pop(idx)
+        card["index"] = None
+        card["img"].config(image="")
+        card["img"].image = None
+        self.canvas.itemconfigure(card["window"], state="hidden")
+        self._free.append(card)
+
+    def _paint(self, card, idx):
+        bg, _, select_bg = self.colors
+        color = select_bg if idx == self.selected else bg
+        item = self.items[idx]
+        for w in (card["frame"], card["img"], card["text"]):
+            w.config(bg=color)
+        card["text"].config(text=item.get("strMeal", "—"))
+        photo = self._photos.get(item.get("strMealThumb"))
+        card["img"].config(image=photo or "")
+        card["img"].image = photo
+
+    def _clicked(self, card):
+        idx = card["index"]
+        if idx is None:
+            return
+        self.select(idx)
+        if self.on_select:
+            self.on_select(idx)
+
+    # ---------------- lazy image loading ----------------
+    def _schedule_images(self):
+        first, last = self._visible_rows(PREFETCH_ROWS)
+        self._queue.clear()
+        self._queued.clear()
+        for idx in range(first * self._cols, min(len(self.items), (last + 1) * self._cols)):
+            url = self.items[idx].get("strMealThumb")
+            if url and url not in self._photos and url not in self._inflight and url not in self._queued:
+                self._queue.append(url)
+                self._queued.add(url)
+        self._pump()
+
+    def _pump(self):
+        while self._queue and len(self._inflight) < MAX_INFLIGHT:
+            url = self._queue.popleft()
+            self._queued.discard(url)
+            self._inflight.add(url)
+            self.load_image(url, THUMB_SIZE, lambda photo, u=url: self._image_ready(u, photo))
+
+    def _image_ready(self, url, photo):
+        self._inflight.discard(url)
+        if photo is not None:
+            self._photos[url] = photo
+            for idx, card in self._cards.items():
+                if self.items[idx].get("strMealThumb") == url:
+                    card["img"].config(image=photo)
+                    card["img"].image = photo
+        self._pump()
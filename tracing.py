@@ -0,0 +1,183 @@
+# tracing.py
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# ---------------- spans ----------------
+# Лёгкие интервалы времени: где уходит время (сеть, JSON, декодирование картинок, Tk).
+# Пишутся в кольцевой буфер (старые вытесняются), выгружаются в JSONL или Chrome trace
+# (chrome://tracing, Perfetto).
+#
+#   MEALFINDER_TRACE=0              — выключить запись
+#   MEALFINDER_TRACE_BUFFER=20000   — размер буфера (число интервалов)
+#   MEALFINDER_TRACE_FILE=trace.json — выгрузить при выходе (.json — Chrome trace, иначе JSONL)
+
+TRACE_ENABLED = os.environ.get("MEALFINDER_TRACE", "1") != "0"
+TRACE_BUFFER = int(os.environ.get("MEALFINDER_TRACE_BUFFER", "20000"))
+TRACE_FILE = os.environ.get("MEALFINDER_TRACE_FILE", "")
+
+# границы корзин гистограммы, мс (последняя корзина — всё, что больше)
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+_T0 = time.perf_counter_ns()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer.record(self.name, self.cat, self.start, end - self.start, exc_type is None, self.args)
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Кольцевой буфер интервалов; span() — контекстный менеджер."""
+
+    def __init__(self, capacity=TRACE_BUFFER, enabled=TRACE_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._buf = deque(maxlen=capacity)
+
+    def span(self, name, cat="app", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def record(self, name, cat, start_ns, dur_ns, ok=True, args=None):
+        # (name, cat, старт мкс, длительность мкс, поток, ok, args); start_ns — time.perf_counter_ns()
+        if not self.enabled:
+            return
+        rec = (name, cat, (start_ns - _T0) / 1000.0, dur_ns / 1000.0, threading.get_ident(), ok, args)
+        with self._lock:
+            self._buf.append(rec)
+
+    def spans(self):
+        with self._lock:
+            return list(self._buf)
+
+    def clear(self):
+        with self._lock:
+            self._buf.clear()
+
+    # ---------------- aggregates ----------------
+    def summary(self):
+        """{имя: {"cat", "count", "errors", "p50", "p95", "max", "hist"}}, времена в мс."""
+        groups = {}
+        for name, cat, _ts, dur, _tid, ok, _args in self.spans():
+            g = groups.setdefault(name, {"cat": cat, "durs": [], "errors": 0})
+            g["durs"].append(dur / 1000.0)
+            if not ok:
+                g["errors"] += 1
+        out = {}
+        for name, g in groups.items():
+            durs = sorted(g["durs"])
+            out[name] = {"cat": g["cat"], "count": len(durs), "errors": g["errors"],
+                         "p50": percentile(durs, 50), "p95": percentile(durs, 95),
+                         "max": durs[-1], "hist": histogram(durs)}
+        return out
+
+    # ---------------- export ----------------
+    def export_jsonl(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for name, cat, ts, dur, tid, ok, args in self.spans():
+                rec = {"name": name, "cat": cat, "ts_us": round(ts, 1), "dur_us": round(dur, 1),
+                       "tid": tid, "ok": ok}
+                if args:
+                    rec["args"] = args
+                f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def export_chrome(self, path):
+        # формат Trace Event: "X" — законченный интервал
+        pid = os.getpid()
+        events = []
+        for name, cat, ts, dur, tid, ok, args in self.spans():
+            ev = {"name": name, "cat": cat, "ph": "X", "ts": ts, "dur": dur, "pid": pid, "tid": tid}
+            if args or not ok:
+                ev["args"] = dict(args or {}, ok=ok)
+            events.append(ev)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+        return path
+
+    def export(self, path):
+        if path.endswith(".json"):
+            return self.export_chrome(path)
+        return self.export_jsonl(path)
+
+
+def percentile(sorted_values, p):
+    # nearest-rank, как bench/run_bench.py: ранг = ceil(p/100 * n)
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p * len(sorted_values) / 100) - 1))
+    return sorted_values[k]
+
+def histogram(durations_ms, bounds=HISTOGRAM_BOUNDS):
+    """Число значений в корзинах: [<=b0, <=b1, ..., >b_last]."""
+    counts = [0] * (len(bounds) + 1)
+    for d in durations_ms:
+        for i, b in enumerate(bounds):
+            if d <= b:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+# ---------------- shared instance ----------------
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+                if TRACE_FILE:
+                    atexit.register(_tracer.export, TRACE_FILE)
+    return _tracer
+
+def span(name, cat="app", **args):
+    return get_tracer().span(name, cat, **args)
+
+def traced(name=None, cat="app"):
+    # трассировщик берётся при вызове, а не при декорировании
+    def wrap(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def inner(*a, **kw):
+            with get_tracer().span(label, cat):
+                return fn(*a, **kw)
+        return inner
+    return wrap
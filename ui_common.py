@@ -0,0 +1,51 @@
+# ui_common.py
+import tkinter as tk
+from tkinter import ttk
+
+# ---------------- Theme (dark purple) ----------------
+BG = "#241B35"
+PANEL = "#2F2447"
+CARD = "#34283F"
+PRIMARY = "#A876F5"
+PRIMARY_HOVER = "#8D63E0"
+TEXT = "#FFFFFF"
+MUTED = "#C9C9D9"
+DANGER = "#E04E4E"
+
+
+def apply_style(root):
+    style = ttk.Style(root)
+    style.theme_use("clam")
+    style.configure("TNotebook", background=BG)
+    style.configure("TNotebook.Tab", background=PANEL, foreground=TEXT, padding=(8,6))
+    style.map("TNotebook.Tab", background=[("selected", PRIMARY)])
+    return style
+
+
+# Make text widgets read-only style (we will enable/disable when updating)
+def set_readonly_text(widget, content):
+    widget.config(state="normal")
+    widget.delete("1.0", "end")
+    widget.insert("1.0", content)
+    widget.config(state="disabled")
+
+def set_listbox_values(lb, values):
+    lb.delete(0, tk.END)
+    for v in values:
+        lb.insert(tk.END, v)
+
+def selected_values(lb):
+    return [lb.get(i) for i in lb.curselection()]
+
+def scrollable_frame(parent):
+    # Canvas + вертикальный скролл; возвращает (canvas, внутренний frame)
+    canvas = tk.Canvas(parent, bg=BG, highlightthickness=0)
+    vsb = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+    canvas.configure(yscrollcommand=vsb.set)
+    vsb.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+
+    inner = tk.Frame(canvas, bg=BG)
+    canvas.create_window((0,0), window=inner, anchor="nw")
+    inner.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    return canvas, inner
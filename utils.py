@@ -1,41 +1,417 @@
 # utils.py
 import json
 import os
+import threading
+from collections import OrderedDict
+
+from filelock import FileLock
+from models import Recipe
+from tracing import traced
 
 FAV_FILE = "favorites.json"
+COMPACT_EVERY = 64  # после стольких записей в журнале снимок переписывается целиком
+IMPORT_BATCH = 256  # строк импорта за одну запись на диск
+
+
+class FavoritesStore:
+    """Избранное: индекс в памяти (Recipe по id) + журнал изменений.
+
+    favorites.json — снимок: список компактных записей Recipe.to_dict() (старый файл
+    с "сырыми" словарями API тоже читается), рядом — журнал favorites.json.journal: по одной JSON-строке на
+    операцию add/update/remove, дописывается с fsync. Время от времени журнал сворачивается
+    в новый снимок (запись во временный файл + os.replace).
+
+    Несколько процессов: каждая запись идёт под блокировкой favorites.json.lock и начинается
+    с подхвата чужих изменений, поэтому никто ничего не затирает. refresh() дёшево (два
+    os.stat) проверяет, не менял ли файлы кто-то ещё, и дочитывает только новый хвост
+    журнала; полная перечитка — только если другой процесс свернул журнал в новый снимок.
+    """
+
+    def __init__(self, path=FAV_FILE):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self._lock = threading.RLock()
+        self._flock = FileLock(path + ".lock")
+        self._items = OrderedDict()   # id -> Recipe
+        self._journal_ops = 0
+        self._journal_pos = 0         # сколько байт журнала уже применено
+        self._snapshot_sig = None     # подпись снимка, из которого загружены данные
+        self._external = set()        # id, изменённые другими процессами и ещё не отданные refresh()
+        self._load()
+
+    # ---------------- load ----------------
+    def _read_snapshot(self):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return []
+        return data if isinstance(data, list) else []
+
+    @traced("favorites.load", cat="disk")
+    def _load(self):
+        with self._lock, self._flock:
+            self._snapshot_sig = _file_sig(self.path)
+            self._items.clear()
+            legacy = False
+            for data in self._read_snapshot():
+                if isinstance(data, dict):
+                    legacy = legacy or "idMeal" in data
+                    recipe = Recipe.from_dict(data)
+                    if recipe.id:
+                        self._items[recipe.id] = recipe
+            self._journal_ops = 0
+            self._journal_pos = 0
+            self._read_journal()
+            # старый снимок из "сырых" словарей API переписываем компактным один раз, сразу
+            if legacy or self._journal_ops >= COMPACT_EVERY:
+                self._write_snapshot()
+
+    def _read_journal(self):
+        # применяет журнал начиная с _journal_pos (только целые строки); вызывается под обеими блокировками
+        try:
+            f = open(self.journal_path, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._journal_pos)
+            torn = False
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break  # недописанная строка после сбоя — дальше ничего нет
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                self._apply(op)
+                self._journal_ops += 1
+                self._journal_pos += len(line)
+            if torn:
+                # обрезаем битый хвост, иначе следующая запись приклеится к нему и тоже не прочитается
+                f.truncate(self._journal_pos)
+
+    def _apply(self, op):
+        # повторное применение безопасно: add существующего и remove отсутствующего ничего не делают.
+        # Возвращает id, если что-то изменилось.
+        if op.get("op") == "add":
+            recipe = Recipe.from_dict(op.get("meal") or {})
+            if recipe.id and recipe.id not in self._items:
+                self._items[recipe.id] = recipe
+                return recipe.id
+        elif op.get("op") == "update":
+            # краткая запись заменяется полной (дозагрузка); отсутствующий id не добавляется
+            recipe = Recipe.from_dict(op.get("meal") or {})
+            if recipe.id in self._items and self._items[recipe.id] != recipe:
+                self._items[recipe.id] = recipe
+                return recipe.id
+        elif op.get("op") == "remove":
+            if self._items.pop(op.get("id"), None) is not None:
+                return op.get("id")
+        return None
+
+    # ---------------- other processes ----------------
+    def _catch_up(self):
+        # под обеими блокировками: применяет то, что записали другие процессы
+        sig = _file_sig(self.path)
+        size = _file_size(self.journal_path)
+        if sig == self._snapshot_sig and size == self._journal_pos:
+            return
+        before = OrderedDict(self._items)
+        if sig != self._snapshot_sig or size < self._journal_pos:
+            self._load()          # журнал свернули в новый снимок — перечитываем целиком
+        else:
+            self._read_journal()  # дописали журнал — читаем только хвост
+        for meal_id in before.keys() | self._items.keys():
+            if before.get(meal_id) is not self._items.get(meal_id) and before.get(meal_id) != self._items.get(meal_id):
+                self._external.add(meal_id)
+
+    def refresh(self):
+        """id, которые другие процессы изменили с прошлого вызова (пустое множество — ничего)."""
+        with self._lock:
+            if _file_sig(self.path) != self._snapshot_sig or _file_size(self.journal_path) != self._journal_pos:
+                with self._flock:
+                    self._catch_up()
+            changed, self._external = self._external, set()
+            return changed
+
+    # ---------------- write ----------------
+    @traced("favorites.append", cat="disk")
+    def _append(self, ops):
+        data = "".join(json.dumps(_serializable(op), ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for op in ops).encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_pos = f.tell()
+        self._journal_ops += len(ops)
+        if self._journal_ops >= COMPACT_EVERY:
+            self._write_snapshot()
+
+    def compact(self):
+        with self._lock, self._flock:
+            self._catch_up()
+            self._write_snapshot()
+
+    @traced("favorites.compact", cat="disk")
+    def _write_snapshot(self):
+        # вызывается под обеими блокировками
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([r.to_dict() for r in self._items.values()], f, ensure_ascii=False,
+                      separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # если упадём здесь, журнал просто применится повторно — это безопасно
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._snapshot_sig = _file_sig(self.path)
+        self._journal_ops = 0
+        self._journal_pos = 0
+
+    # ---------------- public ----------------
+    def all(self):
+        with self._lock:
+            return list(self._items.values())
+
+    def contains(self, meal_id):
+        return meal_id in self._items
+
+    def get(self, meal_id):
+        return self._items.get(meal_id)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, meal):
+        return bool(self.add_many([meal]))
+
+    def remove(self, meal_id):
+        return bool(self.remove_many([meal_id]))
+
+    def add_many(self, meals):
+        """Добавляет пачку одной записью на диск; возвращает id реально добавленных."""
+        with self._lock, self._flock:
+            self._catch_up()
+            ops = []
+            for meal in meals:
+                recipe = Recipe.from_dict(meal) if meal else None
+                if recipe and recipe.id:
+                    op = {"op": "add", "meal": recipe}
+                    if self._apply(op):
+                        ops.append(op)
+            try:
+                self._commit(ops)
+            except OSError:
+                for op in ops:
+                    self._items.pop(op["meal"].id, None)
+                raise
+            return [op["meal"].id for op in ops]
+
+    def remove_many(self, meal_ids):
+        """Удаляет пачку одной записью на диск; возвращает id реально удалённых."""
+        with self._lock, self._flock:
+            self._catch_up()
+            ops = []
+            removed = []
+            for meal_id in meal_ids:
+                recipe = self._items.get(meal_id)
+                op = {"op": "remove", "id": meal_id}
+                if self._apply(op):
+                    ops.append(op)
+                    removed.append(recipe)
+            try:
+                self._commit(ops)
+            except OSError:
+                for recipe in removed:
+                    self._items[recipe.id] = recipe
+                raise
+            return [op["id"] for op in ops]
+
+    def update_many(self, meals):
+        """Заменяет записи, которые уже есть в избранном; возвращает id реально изменённых."""
+        with self._lock, self._flock:
+            self._catch_up()
+            ops = []
+            previous = []
+            for meal in meals:
+                recipe = Recipe.from_dict(meal) if meal else None
+                if recipe and recipe.id:
+                    old = self._items.get(recipe.id)
+                    op = {"op": "update", "meal": recipe}
+                    if self._apply(op):
+                        ops.append(op)
+                        previous.append(old)
+            try:
+                self._commit(ops)
+            except OSError:
+                for old in previous:
+                    self._items[old.id] = old
+                raise
+            return [op["meal"].id for op in ops]
+
+    def _commit(self, ops):
+        # маленькая пачка — строки в журнал; большая — сразу новый снимок (тоже одна запись)
+        if not ops:
+            return
+        if self._journal_ops + len(ops) >= COMPACT_EVERY:
+            self._write_snapshot()
+        else:
+            self._append(ops)
+
+    def replace_all(self, meals):
+        with self._lock, self._flock:
+            before = OrderedDict(self._items)
+            self._items.clear()
+            for meal in meals:
+                if meal:
+                    recipe = Recipe.from_dict(meal)
+                    if recipe.id:
+                        self._items[recipe.id] = recipe
+            try:
+                self._write_snapshot()
+            except OSError:
+                self._items = before
+                raise
+
+    # ---------------- import / export (JSON Lines) ----------------
+    def export_jsonl(self, path):
+        """По одной компактной записи на строку; возвращает число записей."""
+        count = 0
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for recipe in self.all():
+                f.write(json.dumps(recipe.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+                count += 1
+        os.replace(tmp, path)
+        return count
+
+    def import_jsonl(self, path, hydrate=None, batch=IMPORT_BATCH):
+        """Импорт из JSON Lines (компактные записи или "сырые" словари API), по batch строк за раз.
+
+        Дубликаты (уже в избранном или повторы в файле) пропускаются по id.
+        hydrate(ids) -> [meal | None] — дозагрузка полных записей для кратких (например,
+        из filter.php); вызывается один раз на пачку, внутри может работать параллельно.
+        Каждая пачка сохраняется одной записью. Возвращает счётчики.
+        """
+        stats = {"added": 0, "duplicates": 0, "invalid": 0, "hydrated": 0}
+        seen = set()
+        chunk = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    recipe = Recipe.from_dict(json.loads(line))
+                except (ValueError, TypeError, AttributeError):
+                    recipe = None
+                if recipe is None or not recipe.id:
+                    stats["invalid"] += 1
+                    continue
+                if recipe.id in seen or self.contains(recipe.id):
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(recipe.id)
+                chunk.append(recipe)
+                if len(chunk) >= batch:
+                    self._import_chunk(chunk, hydrate, stats)
+                    chunk = []
+        if chunk:
+            self._import_chunk(chunk, hydrate, stats)
+        return stats
+
+    def _import_chunk(self, chunk, hydrate, stats):
+        partial = [r for r in chunk if not r.is_full]
+        if hydrate and partial:
+            try:
+                full = hydrate([r.id for r in partial])
+            except Exception:
+                full = []  # сеть недоступна — сохраним то, что есть
+            by_id = {m.get("idMeal"): m for m in full if m}
+            chunk = [Recipe.from_dict(by_id[r.id]) if r.id in by_id else r for r in chunk]
+            stats["hydrated"] += len(by_id)
+        stats["added"] += len(self.add_many(chunk))
+
+
+def _file_sig(path):
+    # (inode, mtime, ctime, размер): os.replace даёт новый файл, дозапись меняет размер
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+def _file_size(path):
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+def _serializable(op):
+    if isinstance(op.get("meal"), Recipe):
+        return dict(op, meal=op["meal"].to_dict())
+    return op
+
+
+# ---------------- shared instance + старый функциональный API ----------------
+_store = None
+_store_lock = threading.Lock()
+
+def get_store(create=True):
+    # create=False — не читать файл ради проверки (None, если хранилище ещё не открыто)
+    global _store
+    if _store is None and create:
+        with _store_lock:
+            if _store is None:
+                _store = FavoritesStore()
+    return _store
 
 def load_favorites():
-    if not os.path.exists(FAV_FILE):
-        return []
     try:
-        with open(FAV_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
+        return get_store().all()
     except Exception:
         return []
-    return []
 
 def save_favorites(data):
     try:
-        with open(FAV_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        get_store().replace_all(data)
         return True
     except Exception:
         return False
 
+def is_favorite(meal_id):
+    return get_store().contains(meal_id)
+
 def add_to_favorites(meal):
-    if not meal or not meal.get("idMeal"):
-        return False
-    favs = load_favorites()
-    if any(m.get("idMeal") == meal.get("idMeal") for m in favs):
+    try:
+        return get_store().add(meal)
+    except Exception:
         return False
-    favs.append(meal)
-    return save_favorites(favs)
 
 def remove_from_favorites(meal_id):
-    favs = load_favorites()
-    new = [m for m in favs if m.get("idMeal") != meal_id]
-    if len(new) == len(favs):
+    try:
+        return get_store().remove(meal_id)
+    except Exception:
         return False
-    return save_favorites(new)
+
+def remove_many_from_favorites(meal_ids):
+    try:
+        return get_store().remove_many(meal_ids)
+    except Exception:
+        return []
+
+def export_favorites(path):
+    return get_store().export_jsonl(path)
+
+def import_favorites(path, hydrate=True):
+    # краткие записи дозагружаются параллельно через asyncio-клиент
+    fetch = None
+    if hydrate:
+        from aio_api import get_meals_by_ids
+        fetch = get_meals_by_ids
+    return get_store().import_jsonl(path, hydrate=fetch)